@@ -9,13 +9,20 @@ Provides:
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import logging
 from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, TypeVar
 
 import structlog
 from pydantic import BaseModel
 
 logger = structlog.get_logger()
 
+# Strong references to in-flight background tasks (the event loop only keeps weak ones)
+_background_tasks: set[asyncio.Task] = set()
+
 
 class BaseAgent(ABC):
     """Every agent must subclass BaseAgent and implement `process`."""
@@ -23,6 +30,30 @@ class BaseAgent(ABC):
     def __init__(self, agent_name: str) -> None:
         self.agent_name = agent_name
         self.logger = logger.bind(agent=agent_name)
+        # Snapshot alongside the bound logger: lets hot paths skip building
+        # INFO event dicts entirely when the level is filtered out.
+        is_enabled_for = getattr(self.logger, "is_enabled_for", None)
+        self._info_enabled = is_enabled_for(logging.INFO) if is_enabled_for else True
+
+    def _schedule_warmup(self, warmup: Callable[[], Awaitable[None]]) -> None:
+        """
+        Start preloading a model in the background when constructed inside a
+        running event loop; otherwise it is loaded lazily on first request.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._spawn_background(warmup())
+
+    def _spawn_background(self, coro: Awaitable[None]) -> None:
+        """Fire-and-forget `coro` on the running loop, off the request path."""
+        task = asyncio.ensure_future(coro)
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def preload(self) -> None:
+        """Load models / indexes before serving; agents without any keep this no-op."""
 
     @abstractmethod
     async def process(self, input_data: BaseModel) -> BaseModel:
@@ -36,16 +67,18 @@ class BaseAgent(ABC):
         gracefully when one agent fails.
         """
         try:
-            interaction_id = getattr(input_data, "interaction_id", "N/A")
-            self.logger.info(
-                "agent_started",
-                interaction_id=interaction_id,
-            )
+            if self._info_enabled:
+                interaction_id = getattr(input_data, "interaction_id", "N/A")
+                self.logger.info(
+                    "agent_started",
+                    interaction_id=interaction_id,
+                )
             result = await self.process(input_data)
-            self.logger.info(
-                "agent_completed",
-                interaction_id=interaction_id,
-            )
+            if self._info_enabled:
+                self.logger.info(
+                    "agent_completed",
+                    interaction_id=interaction_id,
+                )
             return result
         except Exception as e:
             self.logger.error(
@@ -54,3 +87,15 @@ class BaseAgent(ABC):
                 exc_info=True,
             )
             return None
+
+
+_AgentT = TypeVar("_AgentT", bound=BaseAgent)
+
+
+@functools.lru_cache(maxsize=None)
+def get_agent(agent_cls: type[_AgentT]) -> _AgentT:
+    """
+    Process-wide agent instance, built on first use so only the agents the
+    traffic actually exercises load their models / FAISS index.
+    """
+    return agent_cls()
@@ -0,0 +1,86 @@
+"""
+Micro-batcher — coalesces concurrent single-item calls into one batch call.
+
+Items submitted within a short window share a single blocking batch call
+(a model forward pass, an encode) run in a worker thread, so the per-call
+overhead is paid once per batch. Used by the emotion classifier and KFO.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Generic, Optional, Sequence, TypeVar
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+class AsyncMicroBatcher(Generic[_T, _R]):
+    """
+    Collects items submitted by concurrent requests and passes them to
+    `batch_fn` as one list, resolving one Future per caller with its result.
+    `batch_fn` must return one result per item, in order; on a length
+    mismatch every caller in the batch gets a RuntimeError.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[_T]], Sequence[_R]],
+        max_size: int,
+        window_seconds: float,
+    ) -> None:
+        self.batch_fn = batch_fn
+        self.max_size = max_size
+        self.window_seconds = window_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, item: _T) -> _R:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._worker = loop.create_task(self._run())
+        future = loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> list[tuple[_T, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.window_seconds
+        while len(batch) < self.max_size:
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            try:
+                # The batch runs off-loop; new submissions keep queueing
+                # meanwhile and form the next batch.
+                results = await asyncio.to_thread(self.batch_fn, items)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            if len(results) != len(batch):
+                name = getattr(self.batch_fn, "__name__", repr(self.batch_fn))
+                error = RuntimeError(
+                    f"{name} returned {len(results)} results for a batch of {len(batch)}"
+                )
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
@@ -10,33 +10,99 @@ Responsibilities:
 
 from __future__ import annotations
 
+import bisect
+
+import numpy as np
 from pydantic import BaseModel
 import structlog
 
 from agents.base_agent import BaseAgent
-from agents.emotional_intelligence.emotion_classifier import classify_emotion
+from agents.emotional_intelligence.emotion_classifier import classify_emotion, warmup
 from agents.emotional_intelligence.escalation_policy import check_escalation
 from api.schemas import EIAInput, EIAOutput
 
 logger = structlog.get_logger()
 
-# Tone recommendations based on sentiment ranges
-_TONE_MAP: list[tuple[float, float, str]] = [
-    (-1.0, -0.65, "highly empathetic and apologetic"),
-    (-0.65, -0.3, "empathetic and understanding"),
-    (-0.3, 0.0, "warm and supportive"),
-    (0.0, 0.3, "neutral and professional"),
-    (0.3, 0.65, "friendly and positive"),
-    (0.65, 1.0, "enthusiastic and celebratory"),
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Tone recommendations based on sentiment ranges — bin i covers
+# [_TONE_THRESHOLDS[i-1], _TONE_THRESHOLDS[i])
+_TONE_THRESHOLDS: tuple[float, ...] = (-0.65, -0.3, 0.0, 0.3, 0.65)
+_TONE_STRINGS: list[str] = [
+    "highly empathetic and apologetic",
+    "empathetic and understanding",
+    "warm and supportive",
+    "neutral and professional",
+    "friendly and positive",
+    "enthusiastic and celebratory",
 ]
 
 
 def _get_tone_recommendation(sentiment_score: float) -> str:
     """Map a sentiment score to a tone recommendation."""
-    for low, high, tone in _TONE_MAP:
-        if low <= sentiment_score < high:
-            return tone
-    return "neutral and professional"
+    return _TONE_STRINGS[bisect.bisect_right(_TONE_THRESHOLDS, sentiment_score)]
+
+
+# Fixed emotion order and valence signs: positive emotions add,
+# negative emotions subtract, neutral contributes nothing.
+_EMOTIONS: tuple[str, ...] = (
+    "joy", "surprise", "love",
+    "anger", "disgust", "fear", "sadness", "distress",
+    "neutral",
+)
+_EMOTION_INDEX: dict[str, int] = {e: i for i, e in enumerate(_EMOTIONS)}
+_SIGN = np.array([1, 1, 1, -1, -1, -1, -1, -1, 0], dtype=np.float64)
+
+
+def _emotion_vector(emotions: dict[str, float]) -> np.ndarray:
+    """Pack an emotion distribution into a dense vector aligned to `_EMOTIONS`."""
+    vec = np.zeros(len(_EMOTIONS), dtype=np.float64)
+    for label, score in emotions.items():
+        idx = _EMOTION_INDEX.get(label)
+        if idx is not None:
+            vec[idx] = score
+    return vec
+
+
+def _sentiment_from_vector(vec: np.ndarray) -> float:
+    """Signed dot product of an emotion vector, clamped to [-1, 1]."""
+    return float(np.clip(vec @ _SIGN, -1.0, 1.0))
+
+
+def _score_and_tone_kernel(vec: np.ndarray) -> tuple[float, int]:
+    """
+    Fused sentiment + tone bin for an emotion vector aligned to `_EMOTIONS`.
+    Returns (clamped sentiment, index into `_TONE_STRINGS`).
+    """
+    s = 0.0
+    for i in range(vec.shape[0]):
+        s += vec[i] * _SIGN[i]
+    if s < -1.0:
+        s = -1.0
+    elif s > 1.0:
+        s = 1.0
+    idx = 0
+    for t in _TONE_THRESHOLDS:
+        idx += s >= t
+    return s, idx
+
+
+def _score_and_tone_numpy(vec: np.ndarray) -> tuple[float, int]:
+    sentiment = _sentiment_from_vector(vec)
+    return sentiment, bisect.bisect_right(_TONE_THRESHOLDS, sentiment)
+
+
+if NUMBA_AVAILABLE:
+    # Explicit signature compiles eagerly at import, not on the first request
+    _score_and_tone = njit("Tuple((float64, int64))(float64[::1])", cache=True)(
+        _score_and_tone_kernel
+    )
+else:
+    _score_and_tone = _score_and_tone_numpy
 
 
 def _compute_sentiment_from_emotions(emotions: dict[str, float]) -> float:
@@ -44,17 +110,7 @@ def _compute_sentiment_from_emotions(emotions: dict[str, float]) -> float:
     Convert emotion distribution to a single sentiment score in [-1, 1].
     Positive emotions add, negative emotions subtract.
     """
-    positive_emotions = {"joy", "surprise", "love"}
-    negative_emotions = {"anger", "disgust", "fear", "sadness", "distress"}
-
-    pos_score = sum(emotions.get(e, 0.0) for e in positive_emotions)
-    neg_score = sum(emotions.get(e, 0.0) for e in negative_emotions)
-    neutral_score = emotions.get("neutral", 0.0)
-
-    # Weighted combination
-    sentiment = pos_score - neg_score
-    # Clamp to [-1, 1]
-    return max(-1.0, min(1.0, sentiment))
+    return _sentiment_from_vector(_emotion_vector(emotions))
 
 
 class EIAAgent(BaseAgent):
@@ -62,6 +118,10 @@ class EIAAgent(BaseAgent):
 
     def __init__(self) -> None:
         super().__init__(agent_name="EIA")
+        self._schedule_warmup(warmup)
+
+    async def preload(self) -> None:
+        await warmup()
 
     async def process(self, input_data: BaseModel) -> EIAOutput:
         """
@@ -76,13 +136,13 @@ class EIAAgent(BaseAgent):
         emotions = await classify_emotion(data.conversation_text)
 
         # Dominant emotion
-        dominant_emotion = max(emotions, key=emotions.get) if emotions else "neutral"
+        emotion_vec = _emotion_vector(emotions)
+        dominant_emotion = _EMOTIONS[int(emotion_vec.argmax())] if emotion_vec.any() else "neutral"
 
-        # Step 2 — Sentiment score
-        sentiment_score = _compute_sentiment_from_emotions(emotions)
-
-        # Step 3 — Tone recommendation
-        tone_recommendation = _get_tone_recommendation(sentiment_score)
+        # Step 2 + 3 — Sentiment score and tone recommendation
+        sentiment_score, tone_idx = _score_and_tone(emotion_vec)
+        sentiment_score = float(sentiment_score)
+        tone_recommendation = _TONE_STRINGS[tone_idx]
 
         # Step 4 — Escalation check
         should_escalate, reason = check_escalation(
@@ -91,14 +151,15 @@ class EIAAgent(BaseAgent):
             emotion_history=data.conversation_history,
         )
 
-        self.logger.info(
-            "eia_processed",
-            interaction_id=data.interaction_id,
-            sentiment_score=round(sentiment_score, 3),
-            dominant_emotion=dominant_emotion,
-            escalation_flag=should_escalate,
-            tone_recommendation=tone_recommendation,
-        )
+        if self._info_enabled:
+            self.logger.info(
+                "eia_processed",
+                interaction_id=data.interaction_id,
+                sentiment_score=round(sentiment_score, 3),
+                dominant_emotion=dominant_emotion,
+                escalation_flag=should_escalate,
+                tone_recommendation=tone_recommendation,
+            )
 
         return EIAOutput(
             sentiment_score=round(sentiment_score, 4),
@@ -7,33 +7,102 @@ emotion detection with a TextBlob/NLTK-based fallback.
 
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import bisect
+import functools
+import threading
 
 import structlog
 
+from agents.batcher import AsyncMicroBatcher
+
 logger = structlog.get_logger()
 
 _classifier = None
+_load_lock = threading.Lock()
+_warmup_started = False
+_warmup_done = threading.Event()
+
+# Micro-batching: concurrent requests arriving within the window share one
+# pipeline forward pass.
+_BATCH_MAX_SIZE = 16
+_BATCH_WINDOW_SECONDS = 0.008
 
 
 def _get_classifier():
     """Lazy-load the emotion classifier pipeline."""
     global _classifier
     if _classifier is None:
-        try:
-            from transformers import pipeline
-            _classifier = pipeline(
-                "text-classification",
-                model="j-hartmann/emotion-english-distilroberta-base",
-                top_k=None,  # return all labels with scores
-                device=-1,
-            )
-            logger.info("emotion_classifier_loaded")
-        except Exception as e:
-            logger.error("emotion_classifier_load_failed", error=str(e))
+        with _load_lock:  # warmup may be loading from a worker thread
+            if _classifier is None:
+                try:
+                    from transformers import pipeline
+                    _classifier = pipeline(
+                        "text-classification",
+                        model="j-hartmann/emotion-english-distilroberta-base",
+                        top_k=None,  # return all labels with scores
+                        device=-1,
+                    )
+                    logger.info("emotion_classifier_loaded")
+                except Exception as e:
+                    logger.error("emotion_classifier_load_failed", error=str(e))
     return _classifier
 
 
+def _warmup_sync() -> None:
+    classifier = _get_classifier()
+    if classifier is not None:
+        classifier("warmup")  # first forward pass loads vocab / initializes kernels
+
+
+async def warmup() -> None:
+    """
+    Load the pipeline and run one dummy inference off the event loop so the
+    first real request does not pay the model-load latency. Runs once;
+    later callers wait for that first run to finish.
+    """
+    global _warmup_started
+    if _warmup_started:
+        if not _warmup_done.is_set():
+            await asyncio.to_thread(_warmup_done.wait)
+        return
+    _warmup_started = True
+    try:
+        await asyncio.to_thread(_warmup_sync)
+    except Exception as e:
+        logger.warning("emotion_classifier_warmup_failed", error=str(e))
+    finally:
+        _warmup_done.set()
+
+
+def _to_scores(result) -> dict[str, float]:
+    """Normalize one pipeline result (list of label/score dicts) to a dict."""
+    if result and isinstance(result[0], list):
+        result = result[0]
+    return {r["label"]: round(r["score"], 4) for r in result}
+
+
+def _classify_batch(texts: list[str]) -> list[dict[str, float]]:
+    """
+    Blocking classification of one batch (run in a worker thread): the
+    pipeline when it is loaded, otherwise the TextBlob fallback.
+    """
+    classifier = _get_classifier()
+    if classifier is None:
+        return _fallback_classify_batch(texts)
+    texts = [text[:512] for text in texts]  # truncate for model limit
+    if len(texts) == 1:
+        results = [classifier(texts[0])]
+    else:
+        results = classifier(texts, batch_size=len(texts), truncation=True)
+    return [_to_scores(r) for r in results]
+
+
+_batch_queue: AsyncMicroBatcher[str, dict[str, float]] = AsyncMicroBatcher(
+    _classify_batch, _BATCH_MAX_SIZE, _BATCH_WINDOW_SECONDS
+)
+
+
 async def classify_emotion(text: str) -> dict[str, float]:
     """
     Classify emotions in text.
@@ -44,37 +113,59 @@ async def classify_emotion(text: str) -> dict[str, float]:
     if not text or not text.strip():
         return {"neutral": 1.0}
 
-    classifier = _get_classifier()
-    if classifier is not None:
-        try:
-            results = classifier(text[:512])  # truncate for model limit
-            if results and isinstance(results[0], list):
-                return {r["label"]: round(r["score"], 4) for r in results[0]}
-            elif results:
-                return {r["label"]: round(r["score"], 4) for r in results}
-        except Exception as e:
-            logger.error("emotion_classification_failed", error=str(e))
+    # Model or (when it is unavailable) fallback, batched across requests
+    try:
+        results = await _batch_queue.submit(text)
+        if results:
+            return results
+    except Exception as e:
+        logger.error("emotion_classification_failed", error=str(e))
 
     # Fallback: TextBlob-based sentiment → simple emotion mapping
-    return _fallback_classify(text)
+    return await asyncio.to_thread(_fallback_classify, text)
+
+
+@functools.lru_cache(maxsize=1)
+def _sentiment_lexicon():
+    """
+    TextBlob's shared pattern sentiment lexicon (parsed once, on first call).
+    Calling it directly skips the per-text TextBlob / Sentiment namedtuple
+    construction that `TextBlob(text).sentiment` does.
+    """
+    from textblob.en import sentiment
+    return sentiment
+
+
+@functools.lru_cache(maxsize=4096)
+def _polarity(text: str) -> float:
+    """TextBlob polarity in [-1, 1]; deterministic per text, so memoized."""
+    return _sentiment_lexicon()(text)[0]
+
+
+# Polarity buckets: bucket i holds polarity in (_FALLBACK_BINS[i-1], _FALLBACK_BINS[i]]
+_FALLBACK_BINS: tuple[float, ...] = (-0.5, -0.1, 0.1, 0.5)
+_FALLBACK_EMOTIONS: tuple[dict[str, float], ...] = (
+    {"anger": 0.5, "disgust": 0.3, "sadness": 0.2},
+    {"sadness": 0.4, "anger": 0.3, "disgust": 0.2, "neutral": 0.1},
+    {"neutral": 0.8, "sadness": 0.1, "joy": 0.1},
+    {"neutral": 0.5, "joy": 0.3, "surprise": 0.2},
+    {"joy": 0.7, "neutral": 0.2, "surprise": 0.1},
+)
+
+
+def _fallback_classify_batch(texts: list[str]) -> list[dict[str, float]]:
+    """TextBlob polarity → approximate emotion mapping, for many texts at once."""
+    results = []
+    for text in texts:
+        try:
+            polarity = _polarity(text)  # -1 to 1
+        except Exception:
+            results.append({"neutral": 1.0})
+            continue
+        results.append(dict(_FALLBACK_EMOTIONS[bisect.bisect_left(_FALLBACK_BINS, polarity)]))
+    return results
 
 
 def _fallback_classify(text: str) -> dict[str, float]:
     """TextBlob polarity → approximate emotion mapping."""
-    try:
-        from textblob import TextBlob
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity  # -1 to 1
-
-        if polarity > 0.5:
-            return {"joy": 0.7, "neutral": 0.2, "surprise": 0.1}
-        elif polarity > 0.1:
-            return {"neutral": 0.5, "joy": 0.3, "surprise": 0.2}
-        elif polarity > -0.1:
-            return {"neutral": 0.8, "sadness": 0.1, "joy": 0.1}
-        elif polarity > -0.5:
-            return {"sadness": 0.4, "anger": 0.3, "disgust": 0.2, "neutral": 0.1}
-        else:
-            return {"anger": 0.5, "disgust": 0.3, "sadness": 0.2}
-    except Exception:
-        return {"neutral": 1.0}
+    return _fallback_classify_batch([text])[0]
@@ -7,24 +7,9 @@ to decide if the current emotional state warrants escalation.
 
 from __future__ import annotations
 
-from pathlib import Path
 from typing import Optional
 
-import yaml
-import structlog
-
-logger = structlog.get_logger()
-
-_CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "escalation_thresholds.yaml"
-
-
-def _load_config() -> dict:
-    try:
-        with open(_CONFIG_PATH, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f).get("escalation", {})
-    except FileNotFoundError:
-        logger.warning("escalation_config_not_found", path=str(_CONFIG_PATH))
-        return {}
+from config.escalation import get_escalation_thresholds
 
 
 def check_escalation(
@@ -38,30 +23,29 @@ def check_escalation(
     Returns:
         (should_escalate, reason)
     """
-    config = _load_config()
+    policy = get_escalation_thresholds()
     reasons: list[str] = []
 
     # Sentiment threshold
-    threshold = config.get("sentiment", {}).get("threshold", -0.65)
+    threshold = policy.sentiment_threshold
     if sentiment_score < threshold:
         reasons.append(
             f"Sentiment score ({sentiment_score:.2f}) below threshold ({threshold})"
         )
 
     # Consecutive negative emotions
-    trigger_emotions = set(
-        config.get("emotion", {}).get("trigger_emotions", ["anger", "distress"])
-    )
-    consecutive_required = config.get("emotion", {}).get("consecutive_turns", 2)
-
-    # Count consecutive trigger emotions at the end of history
-    check_list = emotion_history + [dominant_emotion]
-    consecutive = 0
-    for em in reversed(check_list):
-        if em in trigger_emotions:
-            consecutive += 1
-        else:
-            break
+    trigger_emotions = policy.trigger_emotions
+    consecutive_required = policy.consecutive_required
+
+    # Count consecutive trigger emotions at the end of history (current turn
+    # first, then walk back through history without building a new list)
+    consecutive = 1 if dominant_emotion in trigger_emotions else 0
+    if consecutive:
+        for i in range(len(emotion_history) - 1, -1, -1):
+            if emotion_history[i] in trigger_emotions:
+                consecutive += 1
+            else:
+                break
 
     if consecutive >= consecutive_required:
         reasons.append(
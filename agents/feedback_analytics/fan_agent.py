@@ -65,14 +65,15 @@ class FANAgent(BaseAgent):
         # Detect knowledge gaps
         knowledge_gaps = detect_knowledge_gaps(past_interactions)
 
-        self.logger.info(
-            "fan_processed",
-            interaction_id=data.interaction_id,
-            csat_score=csat_score,
-            sentiment_trend=sentiment_trend,
-            top_issues_count=len(top_issues),
-            knowledge_gaps_count=len(knowledge_gaps),
-        )
+        if self._info_enabled:
+            self.logger.info(
+                "fan_processed",
+                interaction_id=data.interaction_id,
+                csat_score=csat_score,
+                sentiment_trend=sentiment_trend,
+                top_issues_count=len(top_issues),
+                knowledge_gaps_count=len(knowledge_gaps),
+            )
 
         return FANOutput(
             feedback_analysis=FeedbackAnalysis(
@@ -7,13 +7,16 @@ and knowledge base health.
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
 from typing import Optional
 
 import structlog
 
+from api.schemas import iso_utc_now
+
 logger = structlog.get_logger()
 
+_UNRESOLVED_INTENTS = frozenset({"unknown", "unclear", "unresolved"})
+
 
 def generate_performance_report(
     interaction_logs: list[dict],
@@ -27,6 +30,7 @@ def generate_performance_report(
         Dict with KPIs: total_interactions, avg_csat, resolution_rate,
         escalation_rate, avg_response_quality, generated_at timestamp.
     """
+    generated_at = iso_utc_now()
     total = len(interaction_logs)
     if total == 0:
         return {
@@ -35,31 +39,31 @@ def generate_performance_report(
             "avg_csat": None,
             "resolution_rate": None,
             "escalation_rate": None,
-            "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "generated_at": generated_at,
         }
 
-    # CSAT
-    csat_scores = [
-        fb.get("csat_score", 0.0) for fb in feedback_data if fb.get("csat_score") is not None
-    ]
-    avg_csat = sum(csat_scores) / len(csat_scores) if csat_scores else None
+    # Resolution + escalation counts in a single pass over the logs
+    resolved = 0
+    escalated = 0
+    for log in interaction_logs:
+        resolved += log.get("intent", "unknown") not in _UNRESOLVED_INTENTS
+        escalated += bool(log.get("escalation_flag", False))
 
-    # Resolution rate
-    resolved = sum(
-        1 for log in interaction_logs
-        if log.get("intent", "unknown") not in ("unknown", "unclear", "unresolved")
-    )
-    resolution_rate = round(resolved / total, 4) if total > 0 else None
-
-    # Escalation rate
-    escalated = sum(1 for log in interaction_logs if log.get("escalation_flag", False))
-    escalation_rate = round(escalated / total, 4) if total > 0 else None
+    # CSAT
+    csat_sum = 0.0
+    csat_count = 0
+    for fb in feedback_data:
+        score = fb.get("csat_score")
+        if score is not None:
+            csat_sum += score
+            csat_count += 1
+    avg_csat = csat_sum / csat_count if csat_count else None
 
     return {
         "period": period_label,
         "total_interactions": total,
         "avg_csat": round(avg_csat, 2) if avg_csat else None,
-        "resolution_rate": resolution_rate,
-        "escalation_rate": escalation_rate,
-        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "resolution_rate": round(resolved / total, 4),
+        "escalation_rate": round(escalated / total, 4),
+        "generated_at": generated_at,
     }
@@ -4,12 +4,25 @@ Trend Analyzer — Aggregates CSAT and issue trends over time.
 
 from __future__ import annotations
 
+from collections import Counter
 from typing import Optional
 
+import numpy as np
 import structlog
 
 logger = structlog.get_logger()
 
+_UNRESOLVED_INTENTS = frozenset({"unknown", "unclear", "unresolved"})
+_MAX_GAP_QUERIES = 3
+# |score change per feedback entry| below this counts as a stable trend
+_TREND_SLOPE_TOLERANCE = 0.15
+
+
+def _feedback_score(fb: dict) -> float:
+    """CSAT (or sentiment) score of a feedback entry; NaN when absent."""
+    score = fb.get("csat_score") or fb.get("sentiment_score")
+    return np.nan if score is None else float(score)
+
 
 def analyze_sentiment_trend(
     feedback_history: list[dict],
@@ -22,25 +35,24 @@ def analyze_sentiment_trend(
     if not feedback_history or len(feedback_history) < 2:
         return None
 
-    scores = []
-    for fb in feedback_history:
-        score = fb.get("csat_score") or fb.get("sentiment_score")
-        if score is not None:
-            scores.append(float(score))
+    scores = np.fromiter(
+        (_feedback_score(fb) for fb in feedback_history),
+        dtype=np.float64,
+        count=len(feedback_history),
+    )
+    scores = scores[~np.isnan(scores)]
 
-    if len(scores) < 2:
+    if scores.size < 2:
         return None
 
-    # Simple linear trend: compare first half avg to second half avg
-    mid = len(scores) // 2
-    first_half_avg = sum(scores[:mid]) / mid
-    second_half_avg = sum(scores[mid:]) / (len(scores) - mid)
-
-    diff = second_half_avg - first_half_avg
+    # Least-squares slope over all entries (closed form, no polyfit overhead)
+    x = np.arange(scores.size, dtype=np.float64)
+    x -= x.mean()
+    slope = (x @ (scores - scores.mean())) / (x @ x)
 
-    if diff > 0.1:
+    if slope > _TREND_SLOPE_TOLERANCE:
         return "improving"
-    elif diff < -0.1:
+    elif slope < -_TREND_SLOPE_TOLERANCE:
         return "declining"
     return "stable"
 
@@ -52,14 +64,10 @@ def extract_top_issues(
     """
     Extract the most common issues/intents from interaction logs.
     """
-    intent_counts: dict[str, int] = {}
-    for log in interaction_logs:
-        intent = log.get("intent", "unknown")
-        if intent and intent != "unknown":
-            intent_counts[intent] = intent_counts.get(intent, 0) + 1
-
-    sorted_intents = sorted(intent_counts.items(), key=lambda x: x[1], reverse=True)
-    return [intent for intent, _ in sorted_intents[:max_issues]]
+    intent_counts = Counter(log.get("intent", "unknown") for log in interaction_logs)
+    for skipped in ("unknown", "", None):
+        intent_counts.pop(skipped, None)
+    return [intent for intent, _ in intent_counts.most_common(max_issues)]
 
 
 def detect_knowledge_gaps(
@@ -72,22 +80,22 @@ def detect_knowledge_gaps(
     gaps: list[str] = []
 
     unresolved_count = 0
-    low_confidence_queries: list[str] = []
+    # Insertion-ordered seen-set: first distinct queries, in log order
+    low_confidence_queries: dict[str, None] = {}
 
     for log in interaction_logs:
         intent = log.get("intent", "unknown")
-        if intent in ("unknown", "unclear", "unresolved"):
+        if intent in _UNRESOLVED_INTENTS:
             unresolved_count += 1
-            query = log.get("customer_message", "")
-            if query:
-                low_confidence_queries.append(query[:100])
+            if len(low_confidence_queries) < _MAX_GAP_QUERIES:
+                query = log.get("customer_message", "")
+                if query:
+                    low_confidence_queries[query[:100]] = None
 
     if unresolved_count > 0:
         gaps.append(f"{unresolved_count} interactions with unresolved intent")
 
-    if low_confidence_queries:
-        unique_queries = list(set(low_confidence_queries))[:3]
-        for q in unique_queries:
-            gaps.append(f"Low-confidence query: '{q}'")
+    for q in low_confidence_queries:
+        gaps.append(f"Low-confidence query: '{q}'")
 
     return gaps
@@ -2,10 +2,17 @@
 Embedder — sentence-transformers wrapper for vectorization.
 
 Encodes text into dense vectors for semantic similarity search.
+Prefers an INT8-quantized ONNX Runtime export of the embedding model,
+falling back to the PyTorch SentenceTransformer and then to hashing.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from typing import Optional
 
 import numpy as np
@@ -14,52 +21,222 @@ import structlog
 logger = structlog.get_logger()
 
 _model = None
+_onnx_session = None
+_onnx_tokenizer = None
+_onnx_failed = False
+_load_lock = threading.Lock()
+_warmup_started = False
+_warmup_done = threading.Event()
+
+# LRU of model embeddings keyed on the input item (text or pair). Rows are
+# read-only views; encode() always returns a fresh array. Hashing-fallback
+# vectors are never cached, so a model that loads later is not shadowed.
+_EMBEDDING_CACHE_SIZE = 4096
+_embedding_cache: OrderedDict[str | tuple[str, str], np.ndarray] = OrderedDict()
+_cache_lock = threading.Lock()  # encode() runs in worker threads
+
+
+def _hub_model_id(model_name: str) -> str:
+    """sentence-transformers short names live under the `sentence-transformers/` org."""
+    return model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+
+def _load_onnx_session(settings):
+    """Export + INT8-quantize the model once (cached on disk) and open a session."""
+    import onnxruntime as ort
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    model_id = _hub_model_id(settings.embedding_model_name)
+    save_dir = Path(settings.onnx_model_dir) / model_id.replace("/", "__")
+    quantized_path = save_dir / "model_quantized.onnx"
+
+    if not quantized_path.exists():
+        ort_model = ORTModelForFeatureExtraction.from_pretrained(model_id, export=True)
+        quantizer = ORTQuantizer.from_pretrained(ort_model)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+        quantizer.quantize(save_dir=save_dir, quantization_config=qconfig)
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = settings.onnx_intra_op_threads
+    session = ort.InferenceSession(
+        str(quantized_path), options, providers=["CPUExecutionProvider"]
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    logger.info("embedder_loaded", model=model_id, backend="onnx_int8")
+    return session, tokenizer
+
+
+def _get_onnx_session():
+    """
+    Lazy-load the INT8-quantized ONNX Runtime session.
+
+    The model is exported and dynamically quantized once, then cached on disk
+    under `settings.onnx_model_dir` and reused across restarts.
+    Returns None when the backend is disabled or cannot be loaded.
+    """
+    global _onnx_session, _onnx_tokenizer, _onnx_failed
+    if _onnx_session is None and not _onnx_failed:
+        with _load_lock:  # warmup may be loading from a worker thread
+            if _onnx_session is None and not _onnx_failed:
+                from config.settings import get_settings
+                settings = get_settings()
+                if settings.embedding_backend != "onnx":
+                    _onnx_failed = True
+                    return None
+                try:
+                    _onnx_session, _onnx_tokenizer = _load_onnx_session(settings)
+                except Exception as e:
+                    _onnx_failed = True
+                    logger.warning("onnx_embedder_unavailable", error=str(e))
+    return _onnx_session
 
 
 def _get_model():
     """Lazy-load the sentence-transformer model."""
     global _model
     if _model is None:
-        try:
-            from sentence_transformers import SentenceTransformer
-            from config.settings import get_settings
-            settings = get_settings()
-            _model = SentenceTransformer(settings.embedding_model_name)
-            logger.info("embedder_loaded", model=settings.embedding_model_name)
-        except Exception as e:
-            logger.error("embedder_load_failed", error=str(e))
+        with _load_lock:
+            if _model is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    from config.settings import get_settings
+                    settings = get_settings()
+                    _model = SentenceTransformer(settings.embedding_model_name)
+                    logger.info("embedder_loaded", model=settings.embedding_model_name)
+                except Exception as e:
+                    logger.error("embedder_load_failed", error=str(e))
     return _model
 
 
-def encode(texts: list[str]) -> Optional[np.ndarray]:
+async def warmup() -> None:
     """
-    Encode a list of texts into embeddings.
-
-    Returns:
-        numpy array of shape (n_texts, embedding_dim) or None on failure.
+    Load the embedding backend and encode one dummy text off the event loop
+    so the first real request does not pay the model-load latency. Runs once;
+    later callers wait for that first run to finish.
     """
+    global _warmup_started
+    if _warmup_started:
+        if not _warmup_done.is_set():
+            await asyncio.to_thread(_warmup_done.wait)
+        return
+    _warmup_started = True
+    try:
+        await asyncio.to_thread(encode, ["warmup"])
+    except Exception as e:
+        logger.warning("embedder_warmup_failed", error=str(e))
+    finally:
+        _warmup_done.set()
+
+
+def _onnx_encode(session, texts: list[str] | list[tuple[str, str]]) -> np.ndarray:
+    """Tokenize → session.run → mean-pool → L2 normalize."""
+    if texts and isinstance(texts[0], tuple):
+        first, second = (list(col) for col in zip(*texts))
+    else:
+        first, second = texts, None
+    tokens = _onnx_tokenizer(
+        first, second, padding=True, truncation=True, max_length=256, return_tensors="np"
+    )
+    input_names = {i.name for i in session.get_inputs()}
+    feeds = {k: v.astype(np.int64) for k, v in tokens.items() if k in input_names}
+    last_hidden = session.run(None, feeds)[0]
+
+    mask = tokens["attention_mask"][..., None].astype(np.float32)
+    pooled = (last_hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+    pooled /= np.linalg.norm(pooled, axis=1, keepdims=True) + 1e-9
+    return pooled.astype(np.float32, copy=False)
+
+
+def _model_encode(texts: list[str] | list[tuple[str, str]]) -> Optional[np.ndarray]:
+    """Encode with the ONNX or PyTorch backend; None when neither is usable."""
+    session = _get_onnx_session()
+    if session is not None:
+        try:
+            return _onnx_encode(session, texts)
+        except Exception as e:
+            logger.error("onnx_encoding_failed", error=str(e))
+
     model = _get_model()
     if model is None:
-        logger.warning("embedder_not_available_using_fallback")
-        return _fallback_encode(texts)
+        return None
     try:
-        embeddings = model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
-        return embeddings
+        embeddings = model.encode(
+            texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return embeddings.astype(np.float32, copy=False)
     except Exception as e:
         logger.error("encoding_failed", error=str(e))
+        return None
+
+
+def encode(texts: list[str] | list[tuple[str, str]]) -> Optional[np.ndarray]:
+    """
+    Encode a list of texts into L2-normalized embeddings.
+
+    Items may also be (first, second) pairs, e.g. (title, content), which are
+    tokenized as a sentence pair instead of being joined into one string.
+    Items seen recently are served from an LRU; only the misses go through
+    the model, as one batch.
+
+    Returns:
+        numpy array of shape (n_texts, embedding_dim) or None on failure.
+    """
+    with _cache_lock:
+        rows = [_embedding_cache.get(t) for t in texts]
+        for t, row in zip(texts, rows):
+            if row is not None:
+                _embedding_cache.move_to_end(t)
+    misses = [i for i, row in enumerate(rows) if row is None]
+    if not misses:
+        return np.stack(rows)
+
+    miss_texts = [texts[i] for i in misses]
+    embeddings = _model_encode(miss_texts)
+    if embeddings is None:
+        logger.warning("embedder_not_available_using_fallback")
         return _fallback_encode(texts)
 
+    embeddings.flags.writeable = False
+    with _cache_lock:
+        for i, text, row in zip(misses, miss_texts, embeddings):
+            rows[i] = row
+            _embedding_cache[text] = row
+            _embedding_cache.move_to_end(text)
+        while len(_embedding_cache) > _EMBEDDING_CACHE_SIZE:
+            _embedding_cache.popitem(last=False)
+    if len(misses) == len(texts):
+        return embeddings.copy()
+    return np.stack(rows)
+
+
+_FALLBACK_DIM = 384  # match MiniLM dimension
+
+
+@functools.lru_cache(maxsize=1)
+def _hashing_vectorizer():
+    """Stateless hashed word 1-2-gram features, L2-normalized (built on first use)."""
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(
+        n_features=_FALLBACK_DIM,
+        ngram_range=(1, 2),
+        norm="l2",
+        alternate_sign=False,
+        dtype=np.float32,
+    )
+
 
-def _fallback_encode(texts: list[str]) -> np.ndarray:
+def _fallback_encode(texts: list[str] | list[tuple[str, str]]) -> np.ndarray:
     """
     Simple TF-based fallback when sentence-transformers is unavailable.
-    Produces fixed-length vectors via hashing.
+    Produces fixed-length vectors via hashing; texts that share words get
+    similar vectors, and the output is stable across processes.
     """
-    dim = 384  # match MiniLM dimension
-    vectors = []
-    for text in texts:
-        np.random.seed(hash(text) % (2**31))
-        vec = np.random.randn(dim).astype(np.float32)
-        vec /= np.linalg.norm(vec) + 1e-9
-        vectors.append(vec)
-    return np.array(vectors)
+    docs = [" ".join(t) if isinstance(t, tuple) else t for t in texts]
+    return _hashing_vectorizer().transform(docs).toarray()
@@ -9,15 +9,19 @@ Responsibilities:
 
 from __future__ import annotations
 
+import asyncio
 import json
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
 
+import numpy as np
 from pydantic import BaseModel
 import structlog
 
 from agents.base_agent import BaseAgent
-from agents.knowledge_base.embedder import encode
+from agents.batcher import AsyncMicroBatcher
+from agents.knowledge_base.embedder import encode, warmup
 from agents.knowledge_base.vector_store import VectorStore
 from api.schemas import FAQArticle, KFOInput, KFOOutput
 
@@ -25,6 +29,32 @@ logger = structlog.get_logger()
 
 _FAQ_PATH = Path(__file__).parent / "faq_db.json"
 
+# Query micro-batching: concurrent queries within the window share one encode()
+_BATCH_MAX_SIZE = 32
+_BATCH_WINDOW_SECONDS = 0.005
+
+# Per-conversation memo of the last query, so repeat turns skip the search
+# (exact repeats skip the embedding too)
+_SESSION_CACHE_SIZE = 10_000
+_REPEAT_SIMILARITY = 0.98  # cosine; query embeddings are unit-length
+
+
+def _encode_rows(texts: list[str]) -> list[Optional[np.ndarray]]:
+    """encode() split into one row per text (all None when encoding fails)."""
+    embeddings = encode(texts)
+    if embeddings is None:
+        return [None] * len(texts)
+    return list(embeddings)
+
+
+class _SessionEntry(NamedTuple):
+    """Last KFO query of a conversation and the output it produced."""
+    query_text: str
+    embedding: np.ndarray
+    top_k: int
+    language: str
+    output: KFOOutput
+
 
 class KFOAgent(BaseAgent):
     """Knowledge Base & FAQ Optimizer Agent."""
@@ -34,6 +64,18 @@ class KFOAgent(BaseAgent):
         self.vector_store = VectorStore(dimension=384)
         self._faq_data: list[dict] = []
         self._loaded = False
+        # session_id → last query / output, LRU-ordered
+        self._sessions: OrderedDict[str, _SessionEntry] = OrderedDict()
+        # Concurrent queries share one encode() call
+        self._batcher: AsyncMicroBatcher[str, Optional[np.ndarray]] = AsyncMicroBatcher(
+            _encode_rows, _BATCH_MAX_SIZE, _BATCH_WINDOW_SECONDS
+        )
+        self._schedule_warmup(warmup)
+
+    async def preload(self) -> None:
+        """Load the embedder, then embed the FAQ corpus into the index."""
+        await warmup()
+        await asyncio.to_thread(self._ensure_loaded)
 
     def _ensure_loaded(self) -> None:
         """Load FAQ data and build vector index on first call."""
@@ -53,9 +95,9 @@ class KFOAgent(BaseAgent):
             self._loaded = True
             return
 
-        # Embed all FAQ content
-        texts = [f"{faq['title']} {faq['content']}" for faq in self._faq_data]
-        embeddings = encode(texts)
+        # Embed all FAQ content as (title, content) sentence pairs
+        pairs = [(faq["title"], faq["content"]) for faq in self._faq_data]
+        embeddings = encode(pairs)
 
         if embeddings is not None:
             metadata_list = [
@@ -68,7 +110,7 @@ class KFOAgent(BaseAgent):
                 }
                 for faq in self._faq_data
             ]
-            self.vector_store.add(embeddings, metadata_list)
+            self.vector_store.add(embeddings, metadata_list, normalized=True)
             self.logger.info("faq_index_built", num_articles=len(self._faq_data))
 
         self._loaded = True
@@ -82,16 +124,24 @@ class KFOAgent(BaseAgent):
         if not data.query_text.strip():
             return KFOOutput(suggested_faq_articles=[], updated_knowledge=False)
 
-        # Encode query
-        query_embedding = encode([data.query_text])
+        lang = data.language.value if hasattr(data.language, "value") else str(data.language)
+        entry = self._session_entry(data, lang)
+        if entry is not None and entry.query_text == data.query_text:
+            return entry.output
+
+        # Encode query (batched with other in-flight queries)
+        query_embedding = await self._batcher.submit(data.query_text)
         if query_embedding is None:
             return KFOOutput(suggested_faq_articles=[], updated_knowledge=False)
 
+        # Semantically repeated turn: the previous answer still applies
+        if entry is not None and float(query_embedding @ entry.embedding) > _REPEAT_SIMILARITY:
+            return entry.output
+
         # Search
-        results = self.vector_store.search(query_embedding[0], top_k=data.top_k)
+        results = self.vector_store.search(query_embedding, top_k=data.top_k)
 
         # Filter by language if specified
-        lang = data.language.value if hasattr(data.language, "value") else str(data.language)
         filtered = [r for r in results if r.get("language", "en") == lang]
 
         # If no results for the specific language, use all results
@@ -116,7 +166,25 @@ class KFOAgent(BaseAgent):
             results_count=len(articles),
         )
 
-        return KFOOutput(
+        output = KFOOutput(
             suggested_faq_articles=articles,
             updated_knowledge=False,
         )
+        if data.session_id:
+            self._sessions[data.session_id] = _SessionEntry(
+                data.query_text, query_embedding, data.top_k, lang, output
+            )
+            self._sessions.move_to_end(data.session_id)
+            if len(self._sessions) > _SESSION_CACHE_SIZE:
+                self._sessions.popitem(last=False)
+        return output
+
+    def _session_entry(self, data: KFOInput, lang: str) -> Optional[_SessionEntry]:
+        """The conversation's last query, if it was made with the same top_k / language."""
+        if not data.session_id:
+            return None
+        entry = self._sessions.get(data.session_id)
+        if entry is None or entry.top_k != data.top_k or entry.language != lang:
+            return None
+        self._sessions.move_to_end(data.session_id)
+        return entry
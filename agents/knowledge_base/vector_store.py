@@ -22,6 +22,32 @@ except ImportError:
     FAISS_AVAILABLE = False
     logger.warning("faiss_not_available_using_brute_force")
 
+# HNSW graph parameters
+_HNSW_M = 32
+_HNSW_EF_CONSTRUCTION = 64
+_HNSW_EF_SEARCH = 32
+# Vectors are kept in the exact float32 buffer until this many per dimension
+# have arrived; the INT8 quantizer is then trained on all of them at once.
+_SQ_TRAIN_FACTOR = 4
+
+
+def _normalized_copy(vectors: np.ndarray) -> np.ndarray:
+    """
+    Return an L2-normalized float32 copy of `vectors` (rows = vectors).
+
+    Uses FAISS's in-place SIMD kernel on a single contiguous copy when
+    available, so the caller's array is never mutated.
+    """
+    if FAISS_AVAILABLE:
+        out = np.array(vectors, dtype=np.float32, order="C", copy=True)
+        faiss.normalize_L2(out)
+        return out
+    # Stay float32 so search against the float32 matrix is a single sgemv
+    # (a float64 query would promote, i.e. copy, the whole matrix)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-9
+    return vectors / norms
+
 
 class VectorStore:
     """FAISS-backed vector store with brute-force fallback."""
@@ -29,12 +55,23 @@ class VectorStore:
     def __init__(self, dimension: int = 384, index_path: Optional[str] = None) -> None:
         self.dimension = dimension
         self.index_path = index_path
-        self.vectors: list[np.ndarray] = []
+        # Brute-force fallback storage: one contiguous float32 buffer that
+        # grows geometrically; rows [0, _n) are live.
+        self._matrix: Optional[np.ndarray] = None
+        self._n = 0
         self.metadata: list[dict] = []
         self.index = None
 
         if FAISS_AVAILABLE:
-            self.index = faiss.IndexFlatIP(dimension)  # inner-product (cosine after normalization)
+            # HNSW graph over inner product (cosine after normalization) with
+            # INT8 scalar-quantized storage: sublinear search, ~4x less memory.
+            # The quantizer is trained once `_SQ_TRAIN_FACTOR * dimension`
+            # vectors have been added; until then they are searched exactly.
+            self.index = faiss.IndexHNSWSQ(
+                dimension, faiss.ScalarQuantizer.QT_8bit, _HNSW_M, faiss.METRIC_INNER_PRODUCT
+            )
+            self.index.hnsw.efConstruction = _HNSW_EF_CONSTRUCTION
+            self.index.hnsw.efSearch = _HNSW_EF_SEARCH
 
         if index_path:
             self._load(index_path)
@@ -54,28 +91,70 @@ class VectorStore:
         """Persist index and metadata to disk."""
         p = Path(path)
         p.mkdir(parents=True, exist_ok=True)
+        if FAISS_AVAILABLE and self.index is not None and self._n:
+            self._train_and_flush()  # persist buffered vectors too
         if FAISS_AVAILABLE and self.index is not None and self.index.ntotal > 0:
             faiss.write_index(self.index, str(p / "index.faiss"))
         with open(p / "metadata.json", "w", encoding="utf-8") as f:
             json.dump(self.metadata, f, ensure_ascii=False, indent=2)
 
-    def add(self, vectors: np.ndarray, metadata_list: list[dict]) -> None:
-        """Add vectors and associated metadata."""
+    def add(
+        self,
+        vectors: np.ndarray,
+        metadata_list: list[dict],
+        normalized: bool = False,
+    ) -> None:
+        """
+        Add vectors and associated metadata.
+
+        Pass `normalized=True` when the vectors are already unit-length
+        (e.g. straight from `embedder.encode`) to skip re-normalization.
+        """
         if vectors.ndim == 1:
             vectors = vectors.reshape(1, -1)
 
         # L2-normalize for cosine similarity via inner product
-        norms = np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-9
-        vectors = vectors / norms
+        if not normalized:
+            vectors = _normalized_copy(vectors)
 
-        if FAISS_AVAILABLE and self.index is not None:
-            self.index.add(vectors.astype(np.float32))
+        if FAISS_AVAILABLE and self.index is not None and self.index.is_trained:
+            # ascontiguousarray is a no-op for the float32 rows we usually get
+            self.index.add(np.ascontiguousarray(vectors, dtype=np.float32))
         else:
-            for v in vectors:
-                self.vectors.append(v)
+            self._append(vectors)
+            if (
+                FAISS_AVAILABLE
+                and self.index is not None
+                and self._n >= _SQ_TRAIN_FACTOR * self.dimension
+            ):
+                self._train_and_flush()
 
         self.metadata.extend(metadata_list)
 
+    def _train_and_flush(self) -> None:
+        """Train the quantizer on the buffered vectors and move them into the index."""
+        buffered = self._matrix[:self._n]
+        if not self.index.is_trained:
+            self.index.train(buffered)
+        self.index.add(buffered)
+        self._matrix = None
+        self._n = 0
+
+    def _append(self, vectors: np.ndarray) -> None:
+        """Copy rows into the fallback matrix, doubling capacity on overflow."""
+        k = vectors.shape[0]
+        if self._matrix is None:
+            self._matrix = np.empty((max(k, 1024), self.dimension), dtype=np.float32)
+        elif self._n + k > self._matrix.shape[0]:
+            grown = np.empty(
+                (max(2 * self._matrix.shape[0], self._n + k), self.dimension),
+                dtype=np.float32,
+            )
+            grown[:self._n] = self._matrix[:self._n]
+            self._matrix = grown
+        self._matrix[self._n:self._n + k] = vectors
+        self._n += k
+
     def search(self, query_vector: np.ndarray, top_k: int = 5) -> list[dict]:
         """
         Search for top-k most similar vectors.
@@ -84,27 +163,31 @@ class VectorStore:
         if query_vector.ndim == 1:
             query_vector = query_vector.reshape(1, -1)
 
-        norm = np.linalg.norm(query_vector) + 1e-9
-        query_vector = query_vector / norm
+        query_vector = _normalized_copy(query_vector)
 
         if FAISS_AVAILABLE and self.index is not None and self.index.ntotal > 0:
-            scores, indices = self.index.search(query_vector.astype(np.float32), min(top_k, self.index.ntotal))
+            scores, indices = self.index.search(
+                np.ascontiguousarray(query_vector, dtype=np.float32),
+                min(top_k, self.index.ntotal),
+            )
             results = []
-            for score, idx in zip(scores[0], indices[0]):
+            for score, idx in zip(scores[0].tolist(), indices[0].tolist()):
                 if idx < len(self.metadata) and idx >= 0:
                     entry = dict(self.metadata[idx])
-                    entry["score"] = float(score)
+                    entry["score"] = score
                     results.append(entry)
             return results
-        elif self.vectors:
-            # Brute-force fallback
-            mat = np.array(self.vectors)
-            scores = mat @ query_vector.flatten()
-            top_idx = np.argsort(scores)[::-1][:top_k]
+        elif self._n:
+            # Brute force (no FAISS, or quantizer not trained yet): GEMV over
+            # the live rows, O(N) top-k select
+            scores = self._matrix[:self._n] @ query_vector.ravel()
+            k = min(top_k, self._n)
+            top_idx = np.argpartition(scores, -k)[-k:]
+            top_idx = top_idx[np.argsort(scores[top_idx])[::-1]]
             results = []
-            for idx in top_idx:
+            for idx, score in zip(top_idx.tolist(), scores[top_idx].tolist()):
                 entry = dict(self.metadata[idx])
-                entry["score"] = float(scores[idx])
+                entry["score"] = score
                 results.append(entry)
             return results
         return []
@@ -112,5 +195,5 @@ class VectorStore:
     @property
     def size(self) -> int:
         if FAISS_AVAILABLE and self.index is not None:
-            return self.index.ntotal
-        return len(self.vectors)
+            return self.index.ntotal + self._n
+        return self._n
@@ -1,15 +1,33 @@
 """
-Language Detector — langdetect wrapper.
+Language Detector — Arabic-script vs Latin-letter character count.
 Returns 'en' or 'ar' (defaults to 'en' for unsupported languages).
+
+The supported output set is just {en, ar}, so instead of a statistical
+n-gram profile the two scripts are matched with compiled character-class
+regexes (scanned in C). Text with no Arabic-script character at all — the
+common case — is settled by a single search.
 """
 
 from __future__ import annotations
 
-from langdetect import detect, LangDetectException
+import re
+
 import structlog
 
 logger = structlog.get_logger()
 
+# Arabic script blocks: Arabic, Arabic Supplement, Presentation Forms A / B
+_ARABIC_RANGES: tuple[tuple[int, int], ...] = (
+    (0x0600, 0x0700),
+    (0x0750, 0x0780),
+    (0xFB50, 0xFE00),
+    (0xFE70, 0xFF00),
+)
+_ARABIC_RE = re.compile(
+    "[" + "".join(f"\\u{low:04x}-\\u{high - 1:04x}" for low, high in _ARABIC_RANGES) + "]"
+)
+_LATIN_RE = re.compile(r"[A-Za-z]")
+
 
 def detect_language(text: str) -> str:
     """
@@ -19,11 +37,9 @@ def detect_language(text: str) -> str:
     if not text or not text.strip():
         return "en"
 
-    try:
-        lang = detect(text)
-        if lang == "ar":
-            return "ar"
-        return "en"
-    except LangDetectException as e:
-        logger.warning("language_detection_failed", error=str(e))
+    if _ARABIC_RE.search(text) is None:
         return "en"
+
+    if len(_ARABIC_RE.findall(text)) > len(_LATIN_RE.findall(text)):
+        return "ar"
+    return "en"
@@ -82,6 +82,14 @@ _RESPONSE_TEMPLATES: dict[str, dict[str, str]] = {
     },
 }
 
+# Flattened (intent, lang) → text with the English fallback resolved up front,
+# so a response is one hash lookup.
+_RESPONSES: dict[tuple[str, str], str] = {
+    (intent, lang.value): templates.get(lang.value, templates.get("en", ""))
+    for intent, templates in _RESPONSE_TEMPLATES.items()
+    for lang in SupportedLanguage
+}
+
 
 class OCSAgent(BaseAgent):
     """Omni-Channel Support Agent."""
@@ -91,24 +99,23 @@ class OCSAgent(BaseAgent):
 
     async def process(self, input_data: BaseModel) -> OCSOutput:
         """
-        1. Detect language
-        2. Classify intent
-        3. Generate response
+        1. Detect language + classify intent
+        2. Generate response
         """
         data: OCSInput = input_data  # type: ignore[assignment]
 
-        # Step 1 — Language detection
+        # Step 1 — Language detection (a microsecond regex scan, run inline)
+        # and intent classification
         detected_lang = detect_language(data.customer_message)
-        language = SupportedLanguage(detected_lang)
-
-        # Step 2 — Intent classification
         intent, confidence = await classify_intent(data.customer_message)
+        language = SupportedLanguage(detected_lang)
 
-        # Step 3 — Response generation
-        templates = _RESPONSE_TEMPLATES.get(intent, _RESPONSE_TEMPLATES["unknown"])
-        response_text = templates.get(detected_lang, templates.get("en", ""))
+        # Step 2 — Response generation
+        response_text = _RESPONSES.get((intent, detected_lang))
+        if response_text is None:
+            response_text = _RESPONSES["unknown", detected_lang]
 
-        # Step 4 — Check for explicit escalation
+        # Step 3 — Check for explicit escalation
         escalation_flag = intent == "escalation_request"
 
         self.logger.info(
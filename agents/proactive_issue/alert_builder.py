@@ -4,21 +4,24 @@ Alert Builder — Structures detected anomalies into alerts with severity scorin
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from bisect import bisect_right
 
+import numpy as np
 import structlog
 
-from api.schemas import ProactiveAlert, SeverityLevel
+from api.schemas import ProactiveAlert, SeverityLevel, iso_utc_now
 
 logger = structlog.get_logger()
 
-# Map anomaly score ranges to severity levels
-_SEVERITY_MAP: list[tuple[float, float, SeverityLevel]] = [
-    (-float("inf"), -2.0, SeverityLevel.CRITICAL),
-    (-2.0, -1.0, SeverityLevel.HIGH),
-    (-1.0, -0.5, SeverityLevel.MEDIUM),
-    (-0.5, float("inf"), SeverityLevel.LOW),
-]
+# Map anomaly score ranges to severity levels: scores in
+# [_SEVERITY_BINS[i-1], _SEVERITY_BINS[i]) get _SEVERITY_LEVELS[i]
+_SEVERITY_BINS: tuple[float, ...] = (-2.0, -1.0, -0.5)
+_SEVERITY_LEVELS: tuple[SeverityLevel, ...] = (
+    SeverityLevel.CRITICAL,
+    SeverityLevel.HIGH,
+    SeverityLevel.MEDIUM,
+    SeverityLevel.LOW,
+)
 
 # Map data patterns to alert types and recommended actions
 _ALERT_PATTERNS: dict[str, dict[str, str]] = {
@@ -43,10 +46,7 @@ _ALERT_PATTERNS: dict[str, dict[str, str]] = {
 
 def _determine_severity(anomaly_score: float) -> SeverityLevel:
     """Map anomaly score to severity level."""
-    for low, high, severity in _SEVERITY_MAP:
-        if low <= anomaly_score < high:
-            return severity
-    return SeverityLevel.LOW
+    return _SEVERITY_LEVELS[bisect_right(_SEVERITY_BINS, anomaly_score)]
 
 
 def build_alerts(anomalies: list[dict], account_id: str) -> list[ProactiveAlert]:
@@ -54,11 +54,20 @@ def build_alerts(anomalies: list[dict], account_id: str) -> list[ProactiveAlert]
     Convert raw anomaly detections into structured ProactiveAlert objects.
     """
     alerts: list[ProactiveAlert] = []
-
-    for anomaly in anomalies:
-        score = anomaly.get("anomaly_score", 0.0)
+    # One batch shares a wall-clock second; format it once
+    timestamp = iso_utc_now()
+
+    # Bucket every score in one vectorized pass
+    scores = np.fromiter(
+        (a.get("anomaly_score", 0.0) for a in anomalies),
+        dtype=np.float64,
+        count=len(anomalies),
+    )
+    severity_idx = np.digitize(scores, _SEVERITY_BINS)
+
+    for anomaly, idx in zip(anomalies, severity_idx.tolist()):
         data = anomaly.get("data", {})
-        severity = _determine_severity(score)
+        severity = _SEVERITY_LEVELS[idx]
 
         # Determine alert type from the data fields
         alert_type = "general_anomaly"
@@ -75,7 +84,7 @@ def build_alerts(anomalies: list[dict], account_id: str) -> list[ProactiveAlert]
                 alert_type=alert_type,
                 severity=severity,
                 recommended_action=recommended_action,
-                timestamp=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                timestamp=timestamp,
             )
         )
 
@@ -7,17 +7,55 @@ issues before they are reported.
 
 from __future__ import annotations
 
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
 import structlog
 
+if TYPE_CHECKING:
+    from sklearn.ensemble import IsolationForest
+
 logger = structlog.get_logger()
 
+# Below this many samples a 100-tree IsolationForest fit costs far more than
+# it buys; the closed-form Mahalanobis detector is used instead.
+_ISOLATION_FOREST_MIN_SAMPLES = 2000
+
+# One-sided standard-normal quantile for the outlier tail (~4.6%, the mass
+# beyond |z| > 2 in 1-D).
+_TAIL_Z = 1.69
+
+# Fitted IsolationForests keyed on (account_id, feature schema), so one
+# tenant's traffic never shapes another tenant's baseline; LRU-bounded and
+# stored with their fit time. Requests only score against the cached model;
+# once it is older than `_MODEL_REFIT_SECONDS` the latest batch is queued in
+# `_PENDING_REFITS` and refit off the request path (see `refit_pending_models`).
+_MODEL_CACHE_SIZE = 256
+_MODEL_REFIT_SECONDS = 3600.0
+_ModelKey = tuple[str, tuple[str, ...]]
+_MODEL_CACHE: OrderedDict[_ModelKey, tuple["IsolationForest", float]] = OrderedDict()
+_PENDING_REFITS: dict[_ModelKey, np.ndarray] = {}
+_model_lock = threading.Lock()  # refits run in a worker thread
+
+# LRU of extracted features keyed on (account_id, log fingerprint), so a
+# repeated proactive check over the same usage window skips the matrix build
+_FEATURE_CACHE_SIZE = 1024
+_feature_cache: OrderedDict[tuple, tuple[list[str], np.ndarray]] = OrderedDict()
+
+_NUMERIC_TYPES = (int, float, np.number)  # bool is an int subclass
+
+# Mahalanobis scores for cached (read-only) feature matrices, keyed on the
+# matrix's id; the entry holds the matrix itself so the id stays unique.
+_score_cache: OrderedDict[int, tuple[np.ndarray, np.ndarray]] = OrderedDict()
+
 
 def detect_anomalies(
     usage_logs: list[dict],
     threshold: float = -0.5,
+    account_id: Optional[str] = None,
 ) -> list[dict]:
     """
     Detect anomalies in usage logs.
@@ -25,28 +63,25 @@ def detect_anomalies(
     Each usage log is expected to have numeric fields like:
     - api_calls, error_count, latency_ms, login_failures, etc.
 
+    When `account_id` is given and the logs carry timestamps, the extracted
+    features are memoized per (account, usage window).
+
     Returns:
         List of anomaly dicts with keys: index, anomaly_score, fields
     """
     if not usage_logs:
         return []
 
-    # Extract numeric features
-    numeric_keys = _extract_numeric_keys(usage_logs)
+    numeric_keys, feature_matrix = _features(usage_logs, account_id)
     if not numeric_keys:
         return []
 
-    feature_matrix = _build_feature_matrix(usage_logs, numeric_keys)
+    if len(usage_logs) < _ISOLATION_FOREST_MIN_SAMPLES:
+        return _statistical_fallback(usage_logs, numeric_keys, feature_matrix)
 
     try:
-        from sklearn.ensemble import IsolationForest
-
-        model = IsolationForest(
-            contamination=0.1,
-            random_state=42,
-            n_estimators=100,
-        )
-        scores = model.fit(feature_matrix).decision_function(feature_matrix)
+        model = _get_model(account_id, tuple(numeric_keys), feature_matrix)
+        scores = model.decision_function(feature_matrix)
         predictions = model.predict(feature_matrix)
 
         anomalies = []
@@ -67,23 +102,150 @@ def detect_anomalies(
         return _statistical_fallback(usage_logs, numeric_keys, feature_matrix)
 
 
+def _fit_model(matrix: np.ndarray) -> IsolationForest:
+    from sklearn.ensemble import IsolationForest
+
+    return IsolationForest(
+        contamination=0.1,
+        random_state=42,
+        n_estimators=100,
+    ).fit(matrix)
+
+
+def _get_model(
+    account_id: Optional[str],
+    schema: tuple[str, ...],
+    matrix: np.ndarray,
+) -> IsolationForest:
+    """
+    Cached model for this account's feature schema; fits on first use only.
+    A stale model keeps serving while `matrix` is queued for a refit.
+    Without an account there is no baseline to share, so the model is fit
+    on the batch and not cached.
+    """
+    if account_id is None:
+        return _fit_model(matrix)
+
+    key = (account_id, schema)
+    with _model_lock:
+        cached = _MODEL_CACHE.get(key)
+        if cached is not None:
+            _MODEL_CACHE.move_to_end(key)
+            model, fitted_at = cached
+            now = time.monotonic()
+            if now - fitted_at > _MODEL_REFIT_SECONDS:
+                _PENDING_REFITS[key] = matrix
+                # Reset the clock so concurrent requests don't queue the same refit
+                _MODEL_CACHE[key] = (model, now)
+            return model
+
+    model = _fit_model(matrix)
+    _store_model(key, model)
+    return model
+
+
+def _store_model(key: _ModelKey, model: IsolationForest) -> None:
+    with _model_lock:
+        _MODEL_CACHE[key] = (model, time.monotonic())
+        _MODEL_CACHE.move_to_end(key)
+        if len(_MODEL_CACHE) > _MODEL_CACHE_SIZE:
+            evicted, _ = _MODEL_CACHE.popitem(last=False)
+            _PENDING_REFITS.pop(evicted, None)
+
+
+def has_pending_refits() -> bool:
+    return bool(_PENDING_REFITS)
+
+
+def refit_pending_models() -> None:
+    """Refit every stale model on its account's most recent batch (run in a worker thread)."""
+    while True:
+        with _model_lock:
+            if not _PENDING_REFITS:
+                return
+            key, matrix = _PENDING_REFITS.popitem()
+        try:
+            _store_model(key, _fit_model(matrix))
+            logger.info("anomaly_model_refit", features=len(key[1]), samples=len(matrix))
+        except Exception as e:
+            logger.error("anomaly_model_refit_failed", error=str(e))
+
+
+def _log_fingerprint(logs: list[dict]) -> Optional[tuple]:
+    """(length, first timestamp, last timestamp), or None if the logs carry none."""
+    first = logs[0].get("timestamp")
+    last = logs[-1].get("timestamp")
+    if first is None or last is None:
+        return None
+    return len(logs), first, last
+
+
+def _features(
+    logs: list[dict],
+    account_id: Optional[str],
+) -> tuple[list[str], np.ndarray]:
+    """Numeric keys + float64 feature matrix, memoized when a cache key is available."""
+    fingerprint = _log_fingerprint(logs) if account_id is not None else None
+    if fingerprint is None:
+        keys = _extract_numeric_keys(logs)
+        return keys, _build_feature_matrix(logs, keys)
+
+    key = (account_id, fingerprint)
+    cached = _feature_cache.get(key)
+    if cached is not None:
+        _feature_cache.move_to_end(key)
+        return cached
+
+    keys = _extract_numeric_keys(logs)
+    matrix = _build_feature_matrix(logs, keys)
+    matrix.flags.writeable = False  # shared across requests
+    cached = _feature_cache[key] = (keys, matrix)
+    if len(_feature_cache) > _FEATURE_CACHE_SIZE:
+        _feature_cache.popitem(last=False)
+    return cached
+
+
 def _extract_numeric_keys(logs: list[dict]) -> list[str]:
-    """Find all keys with numeric values across logs."""
-    keys = set()
+    """
+    Sorted keys whose values are all numeric across the logs (None = missing).
+    Keys holding any non-numeric value are dropped.
+    """
+    numeric: set[str] = set()
+    rejected: set[str] = set()
     for log in logs:
         for k, v in log.items():
-            if isinstance(v, (int, float)):
-                keys.add(k)
-    return sorted(keys)
+            if v is None:
+                continue
+            if isinstance(v, _NUMERIC_TYPES):
+                numeric.add(k)
+            else:
+                rejected.add(k)
+    return sorted(numeric - rejected)
 
 
 def _build_feature_matrix(logs: list[dict], keys: list[str]) -> np.ndarray:
-    """Build a 2D numpy array from selected numeric keys."""
-    rows = []
-    for log in logs:
-        row = [float(log.get(k, 0.0)) for k in keys]
-        rows.append(row)
-    return np.array(rows, dtype=np.float64)
+    """
+    Build a 2D numpy array from selected numeric keys; missing, None and
+    NaN values become 0.0. Preallocated and filled one column at a time.
+    """
+    n = len(logs)
+    matrix = np.empty((n, len(keys)), dtype=np.float64)
+    for j, key in enumerate(keys):
+        matrix[:, j] = np.fromiter(
+            (v if (v := log.get(key)) is not None else 0.0 for log in logs),
+            dtype=np.float64,
+            count=n,
+        )
+    matrix[np.isnan(matrix)] = 0.0
+    return matrix
+
+
+def _f_to_z(f: np.ndarray, df1: int, df2: int) -> np.ndarray:
+    """Paulson's normal approximation: F(df1, df2) statistic → standard-normal z."""
+    a = 2.0 / (9.0 * df1)
+    b = 2.0 / (9.0 * df2)
+    cbrt = np.cbrt(f)
+    return ((1.0 - b) * cbrt - (1.0 - a)) / np.sqrt(a + b * cbrt * cbrt)
 
 
 def _statistical_fallback(
@@ -91,21 +253,66 @@ def _statistical_fallback(
     keys: list[str],
     matrix: np.ndarray,
 ) -> list[dict]:
-    """Z-score based anomaly detection as fallback."""
+    """
+    Mahalanobis-distance anomaly detection for small batches.
+
+    Each row is measured against the mean/covariance of the *other* rows
+    (leave-one-out, in closed form), so a single extreme row cannot mask
+    itself by inflating the covariance. That distance is F-distributed;
+    rows whose tail z exceeds `_TAIL_Z` are flagged. Scores are scaled so
+    the cutoff sits at -2.0 (the 1-D |z| > 2 rule), negative like
+    IsolationForest's. Batches too short for a k-dim covariance use the
+    per-feature max |z| instead, with the same cutoff.
+    """
     if matrix.shape[0] < 3:
         return []
 
-    mean = matrix.mean(axis=0)
+    scaled = _fallback_scores(matrix)
+    flagged = np.flatnonzero(scaled > 2.0)
+    return [
+        {"index": i, "anomaly_score": round(-score, 4), "data": logs[i]}
+        for i, score in zip(flagged.tolist(), scaled[flagged].tolist())
+    ]
+
+
+def _fallback_scores(matrix: np.ndarray) -> np.ndarray:
+    """
+    Scaled leave-one-out Mahalanobis (or, for wide batches, z-) scores
+    (> 2.0 = outlier). Memoized for read-only matrices, i.e. those served
+    from the feature cache.
+    """
+    if matrix.flags.writeable:
+        return _compute_fallback_scores(matrix)
+    key = id(matrix)
+    cached = _score_cache.get(key)
+    if cached is not None and cached[0] is matrix:
+        _score_cache.move_to_end(key)
+        return cached[1]
+    scaled = _compute_fallback_scores(matrix)
+    _score_cache[key] = (matrix, scaled)
+    if len(_score_cache) > _FEATURE_CACHE_SIZE:
+        _score_cache.popitem(last=False)
+    return scaled
+
+
+def _zscore_scores(matrix: np.ndarray) -> np.ndarray:
+    """Largest per-feature |z| of each row (> 2.0 = outlier)."""
     std = matrix.std(axis=0) + 1e-9
-    z_scores = np.abs((matrix - mean) / std)
-    max_z = z_scores.max(axis=1)
-
-    anomalies = []
-    for i, z in enumerate(max_z):
-        if z > 2.0:
-            anomalies.append({
-                "index": i,
-                "anomaly_score": round(float(-z), 4),
-                "data": logs[i],
-            })
-    return anomalies
+    return np.abs((matrix - matrix.mean(axis=0)) / std).max(axis=1)
+
+
+def _compute_fallback_scores(matrix: np.ndarray) -> np.ndarray:
+    n, k = matrix.shape
+    df2 = n - 1 - k
+    if df2 < 1:
+        # Covariance not estimable (k >= n - 1): score features independently
+        return _zscore_scores(matrix)
+    centered = matrix - matrix.mean(axis=0)
+    cov = np.atleast_2d(np.cov(matrix, rowvar=False, bias=True))
+    inv_cov = np.linalg.pinv(cov)  # tolerates constant / collinear columns
+    d2 = np.einsum("ij,jk,ik->i", centered, inv_cov, centered)
+    # Sherman–Morrison downdate of the covariance: closed-form deleted distance
+    d2_deleted = n * d2 / np.maximum((n - 1) - d2, 1e-9)
+
+    f_stat = d2_deleted * df2 / (k * n)
+    return 2.0 * _f_to_z(f_stat, k, df2) / _TAIL_Z
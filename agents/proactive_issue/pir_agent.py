@@ -9,11 +9,17 @@ Responsibilities:
 
 from __future__ import annotations
 
+import asyncio
+
 from pydantic import BaseModel
 import structlog
 
 from agents.base_agent import BaseAgent
-from agents.proactive_issue.anomaly_detector import detect_anomalies
+from agents.proactive_issue.anomaly_detector import (
+    detect_anomalies,
+    has_pending_refits,
+    refit_pending_models,
+)
 from agents.proactive_issue.alert_builder import build_alerts
 from api.schemas import PIRInput, PIROutput
 
@@ -42,7 +48,10 @@ class PIRAgent(BaseAgent):
             return PIROutput(proactive_alerts=[])
 
         # Step 1 — Anomaly detection
-        anomalies = detect_anomalies(data.usage_logs)
+        anomalies = detect_anomalies(data.usage_logs, account_id=data.account_id)
+        if has_pending_refits():
+            # Stale IsolationForests are refit in a worker thread, not inline
+            self._spawn_background(asyncio.to_thread(refit_pending_models))
 
         # Step 2 — Build alerts
         alerts = build_alerts(anomalies, data.account_id)
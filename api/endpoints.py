@@ -7,10 +7,13 @@ and provides supporting endpoints for escalation, health, and feedback.
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from collections import deque
+from itertools import islice
 from typing import Optional
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import JSONResponse
+import orjson
 import structlog
 
 from api.schemas import (
@@ -18,22 +21,48 @@ from api.schemas import (
     EscalationPayload,
     OrchestratorResponse,
     FANInput,
+    iso_utc_now,
 )
+from agents.base_agent import get_agent
 from agents.feedback_analytics.fan_agent import FANAgent
 
 logger = structlog.get_logger()
 
-router = APIRouter(prefix="/api/v1", tags=["CustomerCareAI"])
 
-# Placeholder escalation queue (in production: Redis / message broker)
-_escalation_queue: list[EscalationPayload] = []
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson instead of the stdlib json module.
+    (fastapi.responses.ORJSONResponse is deprecated in recent FastAPI.)
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
 
 
-@router.post("/interact", response_model=OrchestratorResponse)
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["CustomerCareAI"],
+    default_response_class=ORJSONResponse,
+)
+
+# Placeholder escalation queue (in production: Redis / message broker).
+# Bounded: once full, the oldest entries are dropped on append. Each entry
+# keeps its JSON-mode model_dump() from enqueue time, since payloads never change after.
+_ESCALATION_QUEUE_MAX = 10_000
+_escalation_queue: deque[tuple[EscalationPayload, dict]] = deque(
+    maxlen=_ESCALATION_QUEUE_MAX
+)
+
+
+@router.post(
+    "/interact",
+    response_model=None,
+    responses={200: {"model": OrchestratorResponse}},  # keeps the OpenAPI schema
+)
 async def interact(
     request: CustomerRequest,
     background_tasks: BackgroundTasks,
-) -> OrchestratorResponse:
+) -> ORJSONResponse:
     """
     Main interaction endpoint — passes the request through the full
     agent orchestration pipeline and returns a unified response.
@@ -42,7 +71,9 @@ async def interact(
     from orchestrator.main import run_pipeline
 
     response = await run_pipeline(request, background_tasks)
-    return response
+    # Already validated by construction: dump once and encode with orjson,
+    # skipping FastAPI's response_model re-validation pass
+    return ORJSONResponse(response.model_dump())
 
 
 @router.post("/escalate")
@@ -50,7 +81,7 @@ async def escalate(payload: EscalationPayload) -> dict:
     """
     Receives escalation payloads and queues them for human agents.
     """
-    _escalation_queue.append(payload)
+    _escalation_queue.append((payload, payload.model_dump(mode="json")))
     logger.info(
         "escalation_queued",
         interaction_id=payload.interaction_id,
@@ -60,16 +91,19 @@ async def escalate(payload: EscalationPayload) -> dict:
         "status": "queued",
         "interaction_id": payload.interaction_id,
         "position_in_queue": len(_escalation_queue),
-        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "timestamp": iso_utc_now(),
     }
 
 
 @router.get("/escalation-queue")
 async def get_escalation_queue() -> dict:
     """Return the current escalation queue status."""
+    # Walk only the newest 10 from the tail, returned oldest-first
+    recent = list(islice(reversed(_escalation_queue), 10))
+    recent.reverse()
     return {
         "queue_length": len(_escalation_queue),
-        "items": [item.model_dump() for item in _escalation_queue[-10:]],
+        "items": [dumped for _, dumped in recent],
     }
 
 
@@ -87,8 +121,7 @@ async def submit_feedback(
         customer_feedback=feedback,
         interaction_log={},
     )
-    fan_agent = FANAgent()
-    result = await fan_agent.safe_process(fan_input)
+    result = await get_agent(FANAgent).safe_process(fan_input)
 
     return {
         "status": "received",
@@ -103,5 +136,5 @@ async def health_check() -> dict:
     return {
         "status": "healthy",
         "service": "CustomerCareAI_Ecosystem",
-        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "timestamp": iso_utc_now(),
     }
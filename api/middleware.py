@@ -4,9 +4,9 @@ API Middleware — Auth, rate limiting, and request ID injection.
 
 from __future__ import annotations
 
+import secrets
 import time
-import uuid
-from collections import defaultdict
+from collections import OrderedDict, deque
 
 from fastapi import FastAPI, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -20,7 +20,8 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
     """Inject a unique X-Request-ID header into every request/response."""
 
     async def dispatch(self, request: Request, call_next) -> Response:
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        # Only mint an ID when the client didn't send one (32 hex chars)
+        request_id = request.headers.get("X-Request-ID") or secrets.token_hex(16)
         # Bind to structlog context for this request
         structlog.contextvars.clear_contextvars()
         structlog.contextvars.bind_contextvars(request_id=request_id)
@@ -49,25 +50,43 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     """
     Simple in-memory rate limiter.
     Limits each client IP to `max_requests` per `window_seconds`.
+
+    State is per process and bounded to `max_clients` IPs (least recently
+    seen evicted first), so a flood of unique addresses cannot grow it
+    without limit. With several workers each enforces its own limit.
     """
 
-    def __init__(self, app: FastAPI, max_requests: int = 60, window_seconds: int = 60) -> None:
+    def __init__(
+        self,
+        app: FastAPI,
+        max_requests: int = 60,
+        window_seconds: int = 60,
+        max_clients: int = 100_000,
+    ) -> None:
         super().__init__(app)
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self._requests: dict[str, list[float]] = defaultdict(list)
+        self.max_clients = max_clients
+        # Ring buffer of the last `max_requests` timestamps per IP: the window
+        # is full iff the oldest retained one is still inside it — O(1).
+        self._requests: OrderedDict[str, deque[float]] = OrderedDict()
+
+    def _timestamps(self, client_ip: str) -> deque[float]:
+        timestamps = self._requests.get(client_ip)
+        if timestamps is None:
+            timestamps = self._requests[client_ip] = deque(maxlen=self.max_requests)
+            if len(self._requests) > self.max_clients:
+                self._requests.popitem(last=False)
+        else:
+            self._requests.move_to_end(client_ip)
+        return timestamps
 
     async def dispatch(self, request: Request, call_next) -> Response:
         client_ip = request.client.host if request.client else "unknown"
-        now = time.time()
-
-        # Clean old entries
-        self._requests[client_ip] = [
-            ts for ts in self._requests[client_ip]
-            if now - ts < self.window_seconds
-        ]
+        now = time.monotonic()
 
-        if len(self._requests[client_ip]) >= self.max_requests:
+        timestamps = self._timestamps(client_ip)
+        if len(timestamps) == self.max_requests and now - timestamps[0] < self.window_seconds:
             logger.warning("rate_limit_exceeded", client_ip=client_ip)
             return Response(
                 content='{"detail": "Rate limit exceeded. Try again later."}',
@@ -75,5 +94,5 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 media_type="application/json",
             )
 
-        self._requests[client_ip].append(now)
+        timestamps.append(now)
         return await call_next(request)
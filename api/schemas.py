@@ -5,6 +5,7 @@ All data flowing through the system is validated by these schemas.
 
 from __future__ import annotations
 
+import time
 from datetime import datetime
 from enum import Enum
 from typing import Optional
@@ -12,6 +13,35 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 
+# ── Timestamps ─────────────────────────────────────────────────────────────────
+
+# (epoch second, formatted) — the string only changes once per second
+_iso_cache: tuple[int, str] = (-1, "")
+
+
+def iso_utc(dt: datetime) -> str:
+    """Format an aware UTC datetime like `iso_utc_now` without going through strftime."""
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+        f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
+    )
+
+
+def iso_utc_now() -> str:
+    """Current UTC time as ISO-8601 `YYYY-MM-DDTHH:MM:SSZ` (the `timestamp` fields' format)."""
+    global _iso_cache
+    now = int(time.time())
+    second, text = _iso_cache
+    if now != second:
+        t = time.gmtime(now)
+        text = (
+            f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+            f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}Z"
+        )
+        _iso_cache = (now, text)
+    return text
+
+
 # ── Enums ──────────────────────────────────────────────────────────────────────
 
 class ChannelType(str, Enum):
@@ -62,6 +92,8 @@ class KFOInput(BaseModel):
     query_text: str
     top_k: int = 5
     language: SupportedLanguage = SupportedLanguage.EN
+    # Conversation the query belongs to; lets KFO reuse results for repeat turns
+    session_id: Optional[str] = None
 
 
 class EIAInput(BaseModel):
@@ -144,11 +176,15 @@ class FANOutput(BaseModel):
 # ── Agent Logs ────────────────────────────────────────────────────────────────
 
 class AgentLogs(BaseModel):
-    ocs: dict = Field(default_factory=dict)
-    kfo: dict = Field(default_factory=dict)
-    eia: dict = Field(default_factory=dict)
-    pir: dict = Field(default_factory=dict)
-    fan: dict = Field(default_factory=dict)
+    """
+    Per-agent output, or a status dict when the agent was skipped. Outputs
+    are kept as models and only dumped when the response is serialized.
+    """
+    ocs: dict | OCSOutput = Field(default_factory=dict, union_mode="left_to_right")
+    kfo: dict | KFOOutput = Field(default_factory=dict, union_mode="left_to_right")
+    eia: dict | EIAOutput = Field(default_factory=dict, union_mode="left_to_right")
+    pir: dict | PIROutput = Field(default_factory=dict, union_mode="left_to_right")
+    fan: dict | FANOutput = Field(default_factory=dict, union_mode="left_to_right")
 
 
 # ── Orchestrator Unified Response ─────────────────────────────────────────────
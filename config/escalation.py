@@ -0,0 +1,59 @@
+"""
+Escalation thresholds — `escalation_thresholds.yaml` parsed once per process
+and shared, as one typed `EscalationThresholds`, by the orchestrator's
+escalation gate and the EIA policy.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import structlog
+import yaml
+
+try:  # libyaml C parser when PyYAML was built with it
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+logger = structlog.get_logger()
+
+# Module __file__ is already absolute, so no resolve() (and its stat calls)
+ESCALATION_CONFIG_PATH = Path(__file__).with_name("escalation_thresholds.yaml")
+
+
+@lru_cache(maxsize=1)
+def get_escalation_config() -> dict:
+    """
+    The `escalation:` section of the thresholds file ({} when missing).
+    Treat the result as read-only; it is shared by every caller.
+    """
+    try:
+        with open(ESCALATION_CONFIG_PATH, "r", encoding="utf-8") as f:
+            return (yaml.load(f, Loader=_SafeLoader) or {}).get("escalation", {})
+    except FileNotFoundError:
+        logger.warning("escalation_config_not_found", path=str(ESCALATION_CONFIG_PATH))
+        return {}
+
+
+class EscalationThresholds(NamedTuple):
+    """Escalation scalars resolved once from the config (with defaults)."""
+    sentiment_threshold: float
+    trigger_emotions: frozenset[str]
+    consecutive_required: int
+    max_unresolved: int
+
+
+@lru_cache(maxsize=1)
+def get_escalation_thresholds() -> EscalationThresholds:
+    """Thresholds loaded on first use (not at import), then memoized."""
+    config = get_escalation_config()
+    emotion_cfg = config.get("emotion", {})
+    return EscalationThresholds(
+        sentiment_threshold=config.get("sentiment", {}).get("threshold", -0.65),
+        trigger_emotions=frozenset(emotion_cfg.get("trigger_emotions", ["anger", "distress"])),
+        consecutive_required=emotion_cfg.get("consecutive_turns", 2),
+        max_unresolved=config.get("unresolved", {}).get("max_unresolved_turns", 3),
+    )
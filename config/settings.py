@@ -5,7 +5,9 @@ All environment variables are loaded from .env (or system env) and validated.
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -17,6 +19,7 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        frozen=True,  # one shared instance; immutable so it's safe across threads
     )
 
     # --- Application ---
@@ -32,6 +35,10 @@ class Settings(BaseSettings):
 
     # --- Database ---
     database_url: str = "sqlite+aiosqlite:///./customercareai.db"
+    db_pool_size: int = 25
+    db_max_overflow: int = 25
+    db_pool_recycle: int = 1800  # seconds
+    db_pool_warm: int = 5  # connections opened at startup
 
     # --- FAISS Index ---
     faiss_index_dir: str = "./data/faiss_indices"
@@ -41,6 +48,17 @@ class Settings(BaseSettings):
     emotion_model_name: str = "j-hartmann/emotion-english-distilroberta-base"
     embedding_model_name: str = "all-MiniLM-L6-v2"
 
+    # --- Embedding Runtime ---
+    embedding_backend: str = "onnx"  # "onnx" (INT8 ONNX Runtime) | "torch"
+    onnx_model_dir: str = "./data/onnx_models"
+    onnx_intra_op_threads: int = 0  # 0 = let ONNX Runtime pick physical cores
+    # Fine-tuned intent classifier export (model.onnx + tokenizer + config);
+    # zero-shot BART-MNLI is used when absent
+    intent_onnx_dir: str = "./data/onnx_models/intent"
+
+    # --- Agent Pipeline ---
+    agent_timeout_seconds: float = 10.0  # per agent; a timed-out agent degrades to None
+
     # --- Escalation Thresholds ---
     sentiment_escalation_threshold: float = -0.65
     consecutive_emotion_turns: int = 2
@@ -66,6 +84,10 @@ class Settings(BaseSettings):
         return Path(self.faiss_index_dir)
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Factory — allows easy overriding in tests."""
+    """
+    Factory — parsed once (.env + environment) and memoized.
+    Tests that change the environment call `get_settings.cache_clear()`.
+    """
     return Settings()
@@ -6,14 +6,18 @@ Uses SQLAlchemy 2.0 style with Mapped annotations for full type safety.
 
 from __future__ import annotations
 
-import uuid
+import secrets
+import time
+from contextlib import AsyncExitStack
 from datetime import datetime, timezone
 
+import orjson
 from sqlalchemy import (
     Boolean,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     String,
     Text,
     JSON,
@@ -35,8 +39,13 @@ def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _uuid() -> str:
-    return str(uuid.uuid4())
+def new_id() -> str:
+    """
+    32-char hex id: 48-bit millisecond timestamp followed by 80 random bits
+    (the UUIDv7 layout, as in ULID). New ids sort roughly by creation time,
+    so primary-key inserts land at the right edge of the B-tree.
+    """
+    return f"{time.time_ns() // 1_000_000:012x}{secrets.token_hex(10)}"
 
 
 # ── Conversation ──────────────────────────────────────────────────────────────
@@ -44,7 +53,7 @@ def _uuid() -> str:
 class Conversation(Base):
     __tablename__ = "conversations"
 
-    id: Mapped[str] = mapped_column(String(64), primary_key=True, default=_uuid)
+    id: Mapped[str] = mapped_column(String(64), primary_key=True, default=new_id)
     customer_id: Mapped[str] = mapped_column(String(128), index=True)
     channel: Mapped[str] = mapped_column(String(16), default="chat")
     language: Mapped[str] = mapped_column(String(8), default="en")
@@ -60,10 +69,15 @@ class Conversation(Base):
 
 class InteractionLog(Base):
     __tablename__ = "interaction_logs"
+    # Per-conversation history is read in timestamp order; the composite
+    # index serves that ORDER BY and also covers conversation_id lookups.
+    __table_args__ = (
+        Index("ix_interaction_conv_ts", "conversation_id", "timestamp"),
+    )
 
-    id: Mapped[str] = mapped_column(String(64), primary_key=True, default=_uuid)
+    id: Mapped[str] = mapped_column(String(64), primary_key=True, default=new_id)
     conversation_id: Mapped[str] = mapped_column(
-        String(64), ForeignKey("conversations.id"), index=True
+        String(64), ForeignKey("conversations.id")
     )
     customer_message: Mapped[str] = mapped_column(Text, default="")
     response_text: Mapped[str] = mapped_column(Text, default="")
@@ -84,7 +98,7 @@ class InteractionLog(Base):
 class Feedback(Base):
     __tablename__ = "feedback"
 
-    id: Mapped[str] = mapped_column(String(64), primary_key=True, default=_uuid)
+    id: Mapped[str] = mapped_column(String(64), primary_key=True, default=new_id)
     interaction_id: Mapped[str] = mapped_column(
         String(64), ForeignKey("interaction_logs.id"), index=True
     )
@@ -103,7 +117,7 @@ class Feedback(Base):
 class KBArticle(Base):
     __tablename__ = "kb_articles"
 
-    id: Mapped[str] = mapped_column(String(64), primary_key=True, default=_uuid)
+    id: Mapped[str] = mapped_column(String(64), primary_key=True, default=new_id)
     title: Mapped[str] = mapped_column(String(256))
     content: Mapped[str] = mapped_column(Text)
     language: Mapped[str] = mapped_column(String(8), default="en")
@@ -116,7 +130,36 @@ class KBArticle(Base):
 
 _settings = get_settings()
 
-engine = create_async_engine(_settings.database_url, echo=_settings.debug)
+
+def _pool_kwargs(url: str) -> dict:
+    """
+    Explicit sizing for the default AsyncAdaptedQueuePool. In-memory SQLite
+    gets a StaticPool (one shared connection) that takes no sizing args.
+    """
+    if url.startswith("sqlite") and ":memory:" in url:
+        return {}
+    return {
+        "pool_size": _settings.db_pool_size,
+        "max_overflow": _settings.db_max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": _settings.db_pool_recycle,
+    }
+
+
+def _json_dumps(obj) -> str:
+    """orjson encoder for JSON columns (stdlib json also accepts non-str keys)."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# JSON columns (conversation context, agent logs, feedback lists) are
+# round-tripped every turn, so encode/decode them with orjson.
+engine = create_async_engine(
+    _settings.database_url,
+    echo=_settings.debug,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+    **_pool_kwargs(_settings.database_url),
+)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -124,3 +167,14 @@ async def init_db() -> None:
     """Create all tables (called on startup)."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+async def warm_pool(size: int | None = None) -> None:
+    """
+    Open `size` connections at once and hand them back to the pool, so the
+    first burst of requests does not pay connection setup.
+    """
+    size = _settings.db_pool_warm if size is None else size
+    async with AsyncExitStack() as stack:
+        for _ in range(size):
+            await stack.enter_async_context(engine.connect())
@@ -10,12 +10,9 @@ Handles:
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, timezone
 from typing import Optional
 
 import structlog
-import yaml
-from pathlib import Path
 
 from api.schemas import (
     AgentLogs,
@@ -29,85 +26,132 @@ from api.schemas import (
     PIROutput,
     SeverityLevel,
     SupportedLanguage,
+    iso_utc_now,
 )
+from config.escalation import get_escalation_thresholds
 
 logger = structlog.get_logger()
 
-# Load escalation thresholds
-_thresholds_path = Path(__file__).resolve().parent.parent / "config" / "escalation_thresholds.yaml"
-try:
-    with open(_thresholds_path, "r", encoding="utf-8") as f:
-        ESCALATION_CONFIG = yaml.safe_load(f).get("escalation", {})
-except FileNotFoundError:
-    ESCALATION_CONFIG = {}
 
+# Escalation trigger bits, in the order their reasons are reported
+_ESC_EXPLICIT = 1 << 0
+_ESC_INTENT = 1 << 1
+_ESC_SENTIMENT = 1 << 2
+_ESC_EMOTION = 1 << 3
+_ESC_EIA = 1 << 4
+_ESC_PIR = 1 << 5
+_ESC_UNRESOLVED = 1 << 6
 
-def _check_escalation(
+
+def trigger_streak(context: dict) -> int:
+    """
+    Consecutive trigger emotions at the end of the stored emotion trend.
+    Read from the `trigger_streak` counter kept by ContextManager; contexts
+    written before the counter existed fall back to scanning the trend.
+    """
+    streak = context.get("trigger_streak")
+    if streak is not None:
+        return streak
+    trigger_emotions = get_escalation_thresholds().trigger_emotions
+    streak = 0
+    for emotion in reversed(context.get("emotion_trend", ())):
+        if emotion not in trigger_emotions:
+            break
+        streak += 1
+    return streak
+
+
+def _critical_alert(pir_output: Optional[PIROutput]) -> Optional[str]:
+    """alert_type of the first CRITICAL proactive alert, if any."""
+    if pir_output:
+        for alert in pir_output.proactive_alerts:
+            if alert.severity == SeverityLevel.CRITICAL:
+                return alert.alert_type
+    return None
+
+
+def _evaluate(
     ocs_output: Optional[OCSOutput],
     eia_output: Optional[EIAOutput],
     pir_output: Optional[PIROutput],
     context: dict,
-) -> tuple[bool, Optional[str]]:
-    """
-    Evaluate escalation policy (§8) and return (flag, reason).
-    """
-    reasons: list[str] = []
+    consecutive: int,
+) -> int:
+    """Bitmask of the escalation triggers that fire this turn (0 = none)."""
+    thresholds = get_escalation_thresholds()
+    mask = 0
+    if ocs_output:
+        mask |= _ESC_EXPLICIT * ocs_output.escalation_flag
+        mask |= _ESC_INTENT * (ocs_output.intent == "escalation_request")
+    if eia_output:
+        mask |= _ESC_SENTIMENT * (eia_output.sentiment_score < thresholds.sentiment_threshold)
+        mask |= _ESC_EMOTION * (consecutive >= thresholds.consecutive_required)
+        mask |= _ESC_EIA * eia_output.escalation_flag
+    if _critical_alert(pir_output) is not None:
+        mask |= _ESC_PIR
+    mask |= _ESC_UNRESOLVED * (context.get("unresolved_turns", 0) >= thresholds.max_unresolved)
+    return mask
+
 
-    # OCS: explicit escalation request
-    if ocs_output and ocs_output.escalation_flag:
+def _format_reasons(
+    mask: int,
+    eia_output: Optional[EIAOutput],
+    pir_output: Optional[PIROutput],
+    context: dict,
+    consecutive: int,
+) -> str:
+    """Human-readable reasons for the triggers set in `mask`."""
+    thresholds = get_escalation_thresholds()
+    reasons: list[str] = []
+    if mask & _ESC_EXPLICIT:
         reasons.append("Customer explicitly requested human agent.")
-    if ocs_output and ocs_output.intent == "escalation_request":
+    if mask & _ESC_INTENT:
         reasons.append("Intent classified as escalation_request.")
-
-    # EIA: sentiment threshold
-    sentiment_threshold = ESCALATION_CONFIG.get("sentiment", {}).get("threshold", -0.65)
-    if eia_output and eia_output.sentiment_score < sentiment_threshold:
+    if mask & _ESC_SENTIMENT:
         reasons.append(
-            f"Sentiment score ({eia_output.sentiment_score:.2f}) below threshold ({sentiment_threshold})."
+            f"Sentiment score ({eia_output.sentiment_score:.2f}) below threshold "
+            f"({thresholds.sentiment_threshold})."
         )
-
-    # EIA: consecutive negative emotions
-    trigger_emotions = set(
-        ESCALATION_CONFIG.get("emotion", {}).get("trigger_emotions", ["anger", "distress"])
-    )
-    consecutive_required = ESCALATION_CONFIG.get("emotion", {}).get("consecutive_turns", 2)
-    emotion_trend = context.get("emotion_trend", [])
-    if eia_output:
-        emotion_trend_check = emotion_trend + [eia_output.dominant_emotion]
-        consecutive_count = 0
-        for emotion in reversed(emotion_trend_check):
-            if emotion in trigger_emotions:
-                consecutive_count += 1
-            else:
-                break
-        if consecutive_count >= consecutive_required:
-            reasons.append(
-                f"Dominant emotion ({eia_output.dominant_emotion}) persisted for "
-                f"{consecutive_count} consecutive turns."
-            )
-
-    # EIA escalation flag
-    if eia_output and eia_output.escalation_flag:
+    if mask & _ESC_EMOTION:
+        reasons.append(
+            f"Dominant emotion ({eia_output.dominant_emotion}) persisted for "
+            f"{consecutive} consecutive turns."
+        )
+    if mask & _ESC_EIA:
         reasons.append("Emotional Intelligence Agent triggered escalation.")
-
-    # PIR: critical severity
-    if pir_output:
-        for alert in pir_output.proactive_alerts:
-            if alert.severity == SeverityLevel.CRITICAL:
-                reasons.append(f"Critical proactive alert: {alert.alert_type}.")
-                break
-
-    # Unresolved turns
-    max_unresolved = ESCALATION_CONFIG.get("unresolved", {}).get("max_unresolved_turns", 3)
-    unresolved = context.get("unresolved_turns", 0)
-    if unresolved >= max_unresolved:
+    if mask & _ESC_PIR:
+        reasons.append(f"Critical proactive alert: {_critical_alert(pir_output)}.")
+    if mask & _ESC_UNRESOLVED:
         reasons.append(
-            f"No resolution after {unresolved} consecutive turns (threshold: {max_unresolved})."
+            f"No resolution after {context.get('unresolved_turns', 0)} consecutive turns "
+            f"(threshold: {thresholds.max_unresolved})."
         )
+    return " | ".join(reasons)
 
-    if reasons:
-        return True, " | ".join(reasons)
-    return False, None
+
+def _check_escalation(
+    ocs_output: Optional[OCSOutput],
+    eia_output: Optional[EIAOutput],
+    pir_output: Optional[PIROutput],
+    context: dict,
+) -> tuple[bool, Optional[str]]:
+    """
+    Evaluate escalation policy (§8) and return (flag, reason).
+    Reasons are only formatted when at least one trigger fires.
+    """
+    consecutive = 0
+    if eia_output and eia_output.dominant_emotion in get_escalation_thresholds().trigger_emotions:
+        consecutive = trigger_streak(context) + 1
+
+    mask = _evaluate(ocs_output, eia_output, pir_output, context, consecutive)
+    if not mask:
+        return False, None
+    return True, _format_reasons(mask, eia_output, pir_output, context, consecutive)
+
+
+# Read-only stand-ins for skipped agents (scalar fields only)
+_DEFAULT_OCS = OCSOutput()
+_DEFAULT_EIA = EIAOutput()
 
 
 def aggregate_outputs(
@@ -122,10 +166,12 @@ def aggregate_outputs(
     eia_output: Optional[EIAOutput],
     pir_output: Optional[PIROutput],
     fan_output: Optional[FANOutput] = None,
+    timestamp: Optional[str] = None,
 ) -> OrchestratorResponse:
     """
     Merge all agent outputs into the unified response schema.
     Handles None outputs gracefully (degraded mode).
+    `timestamp` lets the caller reuse its per-request ISO timestamp.
     """
 
     # Escalation gate
@@ -133,35 +179,35 @@ def aggregate_outputs(
         ocs_output, eia_output, pir_output, context
     )
 
-    # Build response text — start from OCS, apply EIA tone recommendation
-    response_text = ""
-    if ocs_output:
-        response_text = ocs_output.response_text
+    # Missing OCS / EIA outputs read their schema defaults ("", "unknown",
+    # 0.0, "neutral") instead of branching per field
+    ocs = ocs_output or _DEFAULT_OCS
+    eia = eia_output or _DEFAULT_EIA
 
     # Tone adjustment hint (logged, not mutating text for now)
-    tone_rec = eia_output.tone_recommendation if eia_output else "neutral"
+    tone_rec = eia.tone_recommendation
 
     response = OrchestratorResponse(
         interaction_id=interaction_id,
-        timestamp=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        timestamp=timestamp or iso_utc_now(),
         customer_id=customer_id,
         channel=channel,
         language=language,
-        response_text=response_text,
-        intent=ocs_output.intent if ocs_output else "unknown",
-        sentiment_score=eia_output.sentiment_score if eia_output else 0.0,
-        dominant_emotion=eia_output.dominant_emotion if eia_output else "neutral",
+        response_text=ocs.response_text,
+        intent=ocs.intent,
+        sentiment_score=eia.sentiment_score,
+        dominant_emotion=eia.dominant_emotion,
         escalation_flag=escalation_flag,
         escalation_reason=escalation_reason,
         suggested_faq_articles=kfo_output.suggested_faq_articles if kfo_output else [],
         proactive_alerts=pir_output.proactive_alerts if pir_output else [],
         feedback_analysis=fan_output.feedback_analysis if fan_output else FeedbackAnalysis(),
         agent_logs=AgentLogs(
-            ocs=ocs_output.model_dump() if ocs_output else {"status": "skipped"},
-            kfo=kfo_output.model_dump() if kfo_output else {"status": "skipped"},
-            eia=eia_output.model_dump() if eia_output else {"status": "skipped"},
-            pir=pir_output.model_dump() if pir_output else {"status": "skipped"},
-            fan=fan_output.model_dump() if fan_output else {"status": "pending_async"},
+            ocs=ocs_output or {"status": "skipped"},
+            kfo=kfo_output or {"status": "skipped"},
+            eia=eia_output or {"status": "skipped"},
+            pir=pir_output or {"status": "skipped"},
+            fan=fan_output or {"status": "pending_async"},
         ),
     )
 
@@ -7,22 +7,58 @@ so each agent has full context on every call.
 
 from __future__ import annotations
 
-import uuid
+import time
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
 from typing import Optional
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from db.models import Conversation, async_session
+from config.escalation import get_escalation_thresholds
+from db.models import Conversation, async_session, new_id
+from orchestrator.aggregator import trigger_streak
 
 
 logger = structlog.get_logger()
 
+# Warm conversations are served from an in-process LRU (with a TTL) so
+# follow-up turns on the same worker skip the SELECT. Without sticky routing
+# a cached snapshot can be stale; `update` detects that via its turn_count
+# guard and re-reads the row rather than overwriting newer turns.
+_CONTEXT_CACHE_SIZE = 10_000
+_CONTEXT_CACHE_TTL = 300.0  # seconds
+
+# Per-conversation window sizes kept in the context blob
+_HISTORY_MAX = 20
+_INTENTS_MAX = 10
+_EMOTIONS_MAX = 10
+
 
 class ContextManager:
     """Manages conversation context persistence."""
 
+    def __init__(self) -> None:
+        # conversation_id → (expires_at, context snapshot)
+        self._cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def _cache_get(self, conversation_id: str) -> Optional[dict]:
+        entry = self._cache.get(conversation_id)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if expires_at < time.monotonic():
+            del self._cache[conversation_id]
+            return None
+        self._cache.move_to_end(conversation_id)
+        return dict(snapshot)
+
+    def _cache_put(self, conversation_id: str, snapshot: dict) -> None:
+        self._cache[conversation_id] = (time.monotonic() + _CONTEXT_CACHE_TTL, snapshot)
+        self._cache.move_to_end(conversation_id)
+        if len(self._cache) > _CONTEXT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
     async def get_or_create(
         self,
         conversation_id: Optional[str],
@@ -33,6 +69,11 @@ class ContextManager:
         Retrieve existing conversation context, or create a new one.
         Returns a plain dict containing the current context snapshot.
         """
+        if conversation_id:
+            cached = self._cache_get(conversation_id)
+            if cached is not None:
+                return cached
+
         async with async_session() as session:
             if conversation_id:
                 result = await session.execute(
@@ -44,7 +85,7 @@ class ContextManager:
                         "context_loaded",
                         conversation_id=conversation_id,
                     )
-                    return {
+                    snapshot = {
                         "conversation_id": conv.id,
                         "customer_id": conv.customer_id,
                         "channel": conv.channel,
@@ -55,12 +96,18 @@ class ContextManager:
                         "is_escalated": conv.is_escalated,
                         "turn_count": conv.context.get("turn_count", 0) if conv.context else 0,
                         "unresolved_turns": conv.context.get("unresolved_turns", 0) if conv.context else 0,
+                        # Rows written before the counter existed are backfilled
+                        # once here instead of rescanning the trend every turn
+                        "trigger_streak": trigger_streak(conv.context or {}),
                     }
+                    if not conv.is_escalated:
+                        self._cache_put(conversation_id, snapshot)
+                    return dict(snapshot)
 
             # Create a new conversation
-            new_id = conversation_id or str(uuid.uuid4())
+            conv_id = conversation_id or new_id()
             conv = Conversation(
-                id=new_id,
+                id=conv_id,
                 customer_id=customer_id,
                 channel=channel,
                 context={
@@ -69,13 +116,14 @@ class ContextManager:
                     "emotion_trend": [],
                     "turn_count": 0,
                     "unresolved_turns": 0,
+                    "trigger_streak": 0,
                 },
             )
             session.add(conv)
             await session.commit()
-            logger.info("context_created", conversation_id=new_id)
-            return {
-                "conversation_id": new_id,
+            logger.info("context_created", conversation_id=conv_id)
+            snapshot = {
+                "conversation_id": conv_id,
                 "customer_id": customer_id,
                 "channel": channel,
                 "language": "en",
@@ -85,64 +133,150 @@ class ContextManager:
                 "is_escalated": False,
                 "turn_count": 0,
                 "unresolved_turns": 0,
+                "trigger_streak": 0,
             }
+            self._cache_put(conv_id, snapshot)
+            return dict(snapshot)
 
     async def update(
         self,
         conversation_id: str,
         response_data: dict,
+        context: Optional[dict] = None,
+        now: Optional[datetime] = None,
     ) -> None:
         """
         Update conversation context with the latest interaction data.
+
+        Pass the snapshot returned by `get_or_create` as `context` to skip
+        re-reading the row: the new context is computed in memory and written
+        with a single UPDATE guarded on the snapshot's `turn_count`. If
+        another worker advanced the conversation meanwhile (the snapshot came
+        from this process's cache and is stale), the guard matches nothing
+        and the turn is folded into the freshly read row instead, so turns
+        and streak counters are never lost. `now` is the turn's UTC time.
         """
+        if now is None:
+            now = datetime.now(timezone.utc)
         async with async_session() as session:
+            if context is not None:
+                new_context = _next_context(context, response_data, now)
+                language = response_data.get("language", context.get("language", "en"))
+                is_escalated = response_data.get("escalation_flag", False)
+                result = await session.execute(
+                    update(Conversation)
+                    .where(
+                        Conversation.id == conversation_id,
+                        Conversation.context["turn_count"].as_integer()
+                        == context.get("turn_count", 0),
+                    )
+                    .values(
+                        context=new_context,
+                        language=language,
+                        is_escalated=is_escalated,
+                        updated_at=now,
+                    )
+                )
+                if result.rowcount == 1:
+                    await session.commit()
+                    self._refresh_cache(
+                        conversation_id, context, new_context, language, is_escalated
+                    )
+                    logger.info(
+                        "context_updated",
+                        conversation_id=conversation_id,
+                        turn=new_context["turn_count"],
+                    )
+                    return
+                # Stale snapshot (or missing row): re-read under a row lock
+                self._cache.pop(conversation_id, None)
+                logger.info("context_update_conflict", conversation_id=conversation_id)
+
             result = await session.execute(
-                select(Conversation).where(Conversation.id == conversation_id)
+                select(Conversation)
+                .where(Conversation.id == conversation_id)
+                .with_for_update()
             )
             conv = result.scalar_one_or_none()
             if not conv:
                 logger.warning("context_update_miss", conversation_id=conversation_id)
                 return
-
-            ctx = conv.context or {}
-            history = ctx.get("history", [])
-            history.append({
-                "role": "customer",
-                "text": response_data.get("customer_message", ""),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            })
-            history.append({
-                "role": "assistant",
-                "text": response_data.get("response_text", ""),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            })
-
-            previous_intents = ctx.get("previous_intents", [])
-            previous_intents.append(response_data.get("intent", "unknown"))
-
-            emotion_trend = ctx.get("emotion_trend", [])
-            emotion_trend.append(response_data.get("dominant_emotion", "neutral"))
-
-            turn_count = ctx.get("turn_count", 0) + 1
-
-            # Track unresolved turns
-            unresolved_turns = ctx.get("unresolved_turns", 0)
-            intent = response_data.get("intent", "unknown")
-            if intent in ("unknown", "unclear", "unresolved"):
-                unresolved_turns += 1
-            else:
-                unresolved_turns = 0
-
-            conv.context = {
-                "history": history[-20:],  # keep last 20 messages
-                "previous_intents": previous_intents[-10:],
-                "emotion_trend": emotion_trend[-10:],
-                "turn_count": turn_count,
-                "unresolved_turns": unresolved_turns,
-            }
+            fresh = {**(conv.context or {}), "language": conv.language}
+            new_context = _next_context(fresh, response_data, now)
+            conv.context = new_context
             conv.language = response_data.get("language", conv.language)
             conv.is_escalated = response_data.get("escalation_flag", False)
-            conv.updated_at = datetime.now(timezone.utc)
-
+            conv.updated_at = now
             await session.commit()
-            logger.info("context_updated", conversation_id=conversation_id, turn=turn_count)
+            logger.info(
+                "context_updated",
+                conversation_id=conversation_id,
+                turn=new_context["turn_count"],
+            )
+
+    def _refresh_cache(
+        self,
+        conversation_id: str,
+        context: dict,
+        new_context: dict,
+        language: str,
+        is_escalated: bool,
+    ) -> None:
+        """
+        Cache the post-turn snapshot; escalated conversations are handed to
+        humans and always re-read from the DB.
+        """
+        if is_escalated or "conversation_id" not in context:
+            self._cache.pop(conversation_id, None)
+        else:
+            self._cache_put(
+                conversation_id,
+                {**context, **new_context, "language": language, "is_escalated": False},
+            )
+
+
+def _next_context(ctx: dict, response_data: dict, now: datetime) -> dict:
+    """Fold one turn into a context snapshot (does not mutate `ctx`)."""
+    iso_now = now.isoformat()
+    # Bounded deques drop the oldest entries on append; they are converted
+    # back to lists only for the (JSON) context written to the DB
+    history = deque(ctx.get("history", ()), maxlen=_HISTORY_MAX)
+    history.append({
+        "role": "customer",
+        "text": response_data.get("customer_message", ""),
+        "timestamp": iso_now,
+    })
+    history.append({
+        "role": "assistant",
+        "text": response_data.get("response_text", ""),
+        "timestamp": iso_now,
+    })
+
+    intent = response_data.get("intent", "unknown")
+    previous_intents = deque(ctx.get("previous_intents", ()), maxlen=_INTENTS_MAX)
+    previous_intents.append(intent)
+    emotion = response_data.get("dominant_emotion", "neutral")
+    emotion_trend = deque(ctx.get("emotion_trend", ()), maxlen=_EMOTIONS_MAX)
+    emotion_trend.append(emotion)
+
+    # Running count of trailing trigger emotions, so the escalation gate
+    # does not rescan the trend every turn
+    if emotion in get_escalation_thresholds().trigger_emotions:
+        streak = trigger_streak(ctx) + 1
+    else:
+        streak = 0
+
+    # Track unresolved turns
+    if intent in ("unknown", "unclear", "unresolved"):
+        unresolved_turns = ctx.get("unresolved_turns", 0) + 1
+    else:
+        unresolved_turns = 0
+
+    return {
+        "history": list(history),
+        "previous_intents": list(previous_intents),
+        "emotion_trend": list(emotion_trend),
+        "turn_count": ctx.get("turn_count", 0) + 1,
+        "unresolved_turns": unresolved_turns,
+        "trigger_streak": streak,
+    }
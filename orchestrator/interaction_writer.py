@@ -0,0 +1,105 @@
+"""
+Interaction Writer — persists one InteractionLog row per pipeline turn.
+
+Rows are queued by the request path and written by a background task in
+batches (one multi-row INSERT + commit per batch), so turns don't each pay
+a commit. Escalated turns cut the batch short and are written immediately.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+import structlog
+from pydantic import BaseModel
+from sqlalchemy import insert
+
+from db.models import InteractionLog, async_session
+
+logger = structlog.get_logger()
+
+_BATCH_SIZE = 64
+_FLUSH_INTERVAL = 0.1  # seconds a batch may wait to fill up
+
+
+class InteractionWriter:
+    """Coalesces InteractionLog rows and bulk-inserts them."""
+
+    def __init__(
+        self,
+        batch_size: int = _BATCH_SIZE,
+        flush_interval: float = _FLUSH_INTERVAL,
+    ) -> None:
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue[Optional[dict]]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def enqueue(self, row: dict) -> None:
+        """
+        Queue an InteractionLog row (column → value); starts the writer on
+        first use. Pydantic models in the row are dumped to JSON-mode dicts
+        at write time. The queue and task belong to the running loop and are
+        recreated when a new loop (e.g. a second app lifespan) takes over.
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._task = loop.create_task(self._run(self._queue))
+        self._queue.put_nowait(row)
+
+    async def close(self) -> None:
+        """Write whatever is still queued and stop the background task."""
+        if (
+            self._task is not None
+            and not self._task.done()
+            and self._loop is asyncio.get_running_loop()
+        ):
+            self._queue.put_nowait(None)
+            await self._task
+        self._task = None
+
+    async def _run(self, queue: asyncio.Queue[Optional[dict]]) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            row = await queue.get()
+            if row is None:  # close() sentinel
+                return
+            batch = [row]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size and not batch[-1].get("escalation_flag"):
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    await self._write(batch)
+                    return
+                batch.append(row)
+            await self._write(batch)
+
+    async def _write(self, rows: list[dict]) -> None:
+        try:
+            rows = [_dump_models(row) for row in rows]
+            async with async_session() as session:
+                await session.execute(insert(InteractionLog), rows)
+                await session.commit()
+        except Exception:
+            # Logging is best-effort; a failed batch must not stop the writer
+            logger.exception("interaction_log_write_failed", rows=len(rows))
+            return
+        logger.debug("interaction_logs_written", rows=len(rows))
+
+
+def _dump_models(row: dict) -> dict:
+    """Row with any pydantic model values replaced by their JSON-mode dump."""
+    return {
+        k: v.model_dump(mode="json") if isinstance(v, BaseModel) else v
+        for k, v in row.items()
+    }
@@ -5,8 +5,32 @@ Every event automatically includes interaction_id, agent_name, and ISO-8601 time
 
 from __future__ import annotations
 
+import orjson
 import structlog
 
+_stack_info_renderer = structlog.processors.StackInfoRenderer()
+
+
+def _orjson_dumps(obj, default) -> bytes:
+    """
+    JSONRenderer serializer: orjson encodes datetimes natively (UTC as `Z`);
+    anything else it cannot encode goes through structlog's `default`.
+    """
+    return orjson.dumps(obj, default=default, option=orjson.OPT_UTC_Z)
+
+
+def _render_exc_and_stack(logger, method_name: str, event_dict: dict) -> dict:
+    """
+    Render tracebacks / stack info only for events that ask for them
+    (logger.exception, exc_info=..., stack_info=True), so plain info
+    events skip frame introspection.
+    """
+    if "exc_info" in event_dict:
+        event_dict = structlog.processors.format_exc_info(logger, method_name, event_dict)
+    if "stack_info" in event_dict:
+        event_dict = _stack_info_renderer(logger, method_name, event_dict)
+    return event_dict
+
 
 def configure_logging(log_level: str = "INFO") -> None:
     """Call once at application startup to wire structured logging."""
@@ -14,16 +38,15 @@ def configure_logging(log_level: str = "INFO") -> None:
         processors=[
             structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
-            structlog.processors.StackInfoRenderer(),
-            structlog.dev.set_exc_info,
+            _render_exc_and_stack,
             structlog.processors.TimeStamper(fmt="iso", utc=True),
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps),
         ],
         wrapper_class=structlog.make_filtering_bound_logger(
             structlog.get_level_from_name(log_level),
         ),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=structlog.BytesLoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
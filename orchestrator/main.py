@@ -1,19 +1,22 @@
 """
 Orchestrator Main — FastAPI application.
 
-Single entry point for all requests. Coordinates the sequential agent pipeline:
-  [OCS] → [KFO] → [EIA] → [PIR] → (response) → [FAN async]
+Single entry point for all requests. Coordinates the agent pipeline:
+  [OCS] → [KFO]  ∥  [EIA]  ∥  [PIR] → (response) → [FAN async]
 """
 
 from __future__ import annotations
 
-import uuid
+import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from typing import Optional
 
 from fastapi import BackgroundTasks, FastAPI
+from pydantic import BaseModel
 import structlog
 
+from agents.base_agent import BaseAgent, get_agent
 from agents.omni_channel_support.ocs_agent import OCSAgent
 from agents.knowledge_base.kfo_agent import KFOAgent
 from agents.emotional_intelligence.eia_agent import EIAAgent
@@ -32,11 +35,13 @@ from api.schemas import (
     OrchestratorResponse,
     PIRInput,
     SupportedLanguage,
+    iso_utc,
 )
 from config.settings import get_settings
-from db.models import init_db
+from db.models import init_db, new_id, warm_pool
 from orchestrator.aggregator import aggregate_outputs
 from orchestrator.context_manager import ContextManager
+from orchestrator.interaction_writer import InteractionWriter
 from orchestrator.logger import configure_logging
 
 logger = structlog.get_logger()
@@ -51,8 +56,14 @@ async def lifespan(app: FastAPI):
     configure_logging(settings.log_level)
     logger.info("starting_up", app=settings.app_name, version=settings.app_version)
     await init_db()
+    await warm_pool()
+    # Build the model-backed agents and wait for their models (and the FAQ
+    # index) to load, so the first request doesn't pay for it
+    await asyncio.gather(get_agent(EIAAgent).preload(), get_agent(KFOAgent).preload())
+    logger.info("agents_preloaded")
     yield
     logger.info("shutting_down")
+    await interaction_writer.close()
 
 
 # ── App ───────────────────────────────────────────────────────────────────────
@@ -73,6 +84,30 @@ app.include_router(router)
 
 # Shared instances
 context_mgr = ContextManager()
+interaction_writer = InteractionWriter()
+
+async def _no_output() -> None:
+    """Placeholder awaitable for an agent that is skipped this turn."""
+    return None
+
+
+async def _run_agent(agent: BaseAgent, input_data: BaseModel) -> Optional[BaseModel]:
+    """
+    `agent.safe_process` bounded by `agent_timeout_seconds`; a slow agent
+    degrades to None like a failed one instead of holding up the response.
+    """
+    try:
+        return await asyncio.wait_for(
+            agent.safe_process(input_data), timeout=settings.agent_timeout_seconds
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            "agent_timed_out",
+            agent=agent.agent_name,
+            interaction_id=getattr(input_data, "interaction_id", "N/A"),
+            timeout=settings.agent_timeout_seconds,
+        )
+        return None
 
 
 # ── Pipeline ──────────────────────────────────────────────────────────────────
@@ -82,14 +117,17 @@ async def run_pipeline(
     background_tasks: BackgroundTasks,
 ) -> OrchestratorResponse:
     """
-    Execute the full agent orchestration pipeline sequentially.
+    Execute the full agent orchestration pipeline.
 
-    Steps 1–4 are sequential; Step 7 (FAN) is async.
-    Any agent failure is caught and logged — the pipeline continues with
-    degraded output.
+    OCS → KFO run in order while EIA and PIR run concurrently with them;
+    Step 7 (FAN) is async.
+    Any agent failure or timeout is caught and logged — the pipeline
+    continues with degraded output.
     """
-    interaction_id = str(uuid.uuid4())
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    interaction_id = new_id()
+    # One clock read per request, reused by the response, context and escalation
+    now = datetime.now(timezone.utc)
+    timestamp = iso_utc(now)
 
     logger.info(
         "pipeline_started",
@@ -106,6 +144,30 @@ async def run_pipeline(
     )
     conversation_id = context["conversation_id"]
 
+    # EIA and PIR only read the raw request, so they start right away and
+    # overlap with OCS → KFO (the only dependent pair).
+
+    # ── Step 3: EIA — Sentiment + Emotion + Tone Adjustment ──────────────
+    eia_input = EIAInput(
+        interaction_id=interaction_id,
+        conversation_text=request.customer_message,
+        conversation_history=request.conversation_history,
+    )
+    eia_agent = get_agent(EIAAgent)
+    eia_task = asyncio.create_task(_run_agent(eia_agent, eia_input))
+
+    # ── Step 4: PIR — Account Anomaly Scan ────────────────────────────────
+    pir_task = None
+    if request.account_id:
+        pir_input = PIRInput(
+            interaction_id=interaction_id,
+            account_id=request.account_id,
+            account_data=request.account_data or {},
+            usage_logs=request.usage_logs or [],
+        )
+        pir_agent = get_agent(PIRAgent)
+        pir_task = asyncio.create_task(_run_agent(pir_agent, pir_input))
+
     # ── Step 1: OCS — Intent + Channel Normalization + Draft Response ─────
     ocs_input = OCSInput(
         interaction_id=interaction_id,
@@ -113,13 +175,11 @@ async def run_pipeline(
         conversation_context=context,
         channel=request.channel,
     )
-    ocs_agent = OCSAgent()
-    ocs_output = await ocs_agent.safe_process(ocs_input)
+    ocs_agent = get_agent(OCSAgent)
+    ocs_output = await _run_agent(ocs_agent, ocs_input)
 
     # Determine language from OCS output
-    detected_language = SupportedLanguage.EN
-    if ocs_output and hasattr(ocs_output, "language"):
-        detected_language = ocs_output.language
+    detected_language = ocs_output.language if ocs_output else SupportedLanguage.EN
 
     # ── Step 2: KFO — Semantic FAQ Retrieval ──────────────────────────────
     query_text = request.customer_message
@@ -131,30 +191,22 @@ async def run_pipeline(
         query_text=query_text,
         top_k=5,
         language=detected_language,
+        session_id=conversation_id,
     )
-    kfo_agent = KFOAgent()
-    kfo_output = await kfo_agent.safe_process(kfo_input)
-
-    # ── Step 3: EIA — Sentiment + Emotion + Tone Adjustment ──────────────
-    eia_input = EIAInput(
-        interaction_id=interaction_id,
-        conversation_text=request.customer_message,
-        conversation_history=request.conversation_history,
+    kfo_agent = get_agent(KFOAgent)
+    kfo_output = await _run_agent(kfo_agent, kfo_input)
+
+    # safe_process already swallows agent errors; anything else (e.g.
+    # cancellation) degrades to a missing output rather than failing the turn
+    eia_output, pir_output = await asyncio.gather(
+        eia_task,
+        pir_task if pir_task is not None else _no_output(),
+        return_exceptions=True,
     )
-    eia_agent = EIAAgent()
-    eia_output = await eia_agent.safe_process(eia_input)
-
-    # ── Step 4: PIR — Account Anomaly Scan ────────────────────────────────
-    pir_output = None
-    if request.account_id:
-        pir_input = PIRInput(
-            interaction_id=interaction_id,
-            account_id=request.account_id,
-            account_data=request.account_data or {},
-            usage_logs=request.usage_logs or [],
-        )
-        pir_agent = PIRAgent()
-        pir_output = await pir_agent.safe_process(pir_input)
+    if isinstance(eia_output, BaseException):
+        eia_output = None
+    if isinstance(pir_output, BaseException):
+        pir_output = None
 
     # ── Step 5: Escalation Gate ───────────────────────────────────────────
     # (handled inside aggregate_outputs via _check_escalation)
@@ -171,6 +223,7 @@ async def run_pipeline(
         kfo_output=kfo_output,
         eia_output=eia_output,
         pir_output=pir_output,
+        timestamp=timestamp,
     )
 
     # Update conversation context
@@ -184,8 +237,25 @@ async def run_pipeline(
             "escalation_flag": response.escalation_flag,
             "language": response.language.value,
         },
+        context=context,
+        now=now,
     )
 
+    # Persist the turn (batched in the background; escalations flush at once)
+    interaction_writer.enqueue({
+        "id": interaction_id,
+        "conversation_id": conversation_id,
+        "customer_message": request.customer_message,
+        "response_text": response.response_text,
+        "intent": response.intent,
+        "sentiment_score": response.sentiment_score,
+        "dominant_emotion": response.dominant_emotion,
+        "escalation_flag": response.escalation_flag,
+        "escalation_reason": response.escalation_reason,
+        "agent_logs": response.agent_logs,  # dumped by the writer, off the request path
+        "timestamp": now,
+    })
+
     # ── If escalated, route to escalation queue ───────────────────────────
     if response.escalation_flag:
         escalation_payload = EscalationPayload(
@@ -218,7 +288,7 @@ async def run_pipeline(
             "past_interactions": [],
         },
     )
-    fan_agent = FANAgent()
+    fan_agent = get_agent(FANAgent)
     background_tasks.add_task(fan_agent.safe_process, fan_input)
 
     logger.info(
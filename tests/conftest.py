@@ -0,0 +1,14 @@
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def embedder():
+    """Embedder module with its backend loaded once for the whole test session."""
+    from agents.knowledge_base import embedder as module
+
+    module.encode(["warmup"])
+    return module
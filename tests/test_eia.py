@@ -2,9 +2,16 @@
 Tests for the Emotional Intelligence Agent (EIA).
 """
 
+import asyncio
+from unittest.mock import patch
+
 import pytest
 
-from agents.emotional_intelligence.emotion_classifier import _fallback_classify
+from agents.emotional_intelligence.emotion_classifier import (
+    _fallback_classify,
+    _fallback_classify_batch,
+    classify_emotion,
+)
 from agents.emotional_intelligence.escalation_policy import check_escalation
 from agents.emotional_intelligence.eia_agent import (
     EIAAgent,
@@ -37,6 +44,11 @@ class TestSentimentComputation:
         score = _compute_sentiment_from_emotions(emotions)
         assert -1.0 <= score <= 1.0
 
+    def test_signed_sum_ignores_unknown_labels(self):
+        emotions = {"joy": 0.5, "fear": 0.2, "neutral": 0.2, "other": 0.1}
+        score = _compute_sentiment_from_emotions(emotions)
+        assert score == pytest.approx(0.3)
+
 
 # ── Tone Recommendation ──────────────────────────────────────────────────────
 
@@ -53,6 +65,49 @@ class TestToneRecommendation:
         tone = _get_tone_recommendation(0.5)
         assert "friendly" in tone.lower() or "positive" in tone.lower()
 
+    def test_bin_edges(self):
+        assert _get_tone_recommendation(-0.65) == "empathetic and understanding"
+        assert _get_tone_recommendation(0.0) == "neutral and professional"
+        assert _get_tone_recommendation(1.0) == "enthusiastic and celebratory"
+
+
+# ── Score / Tone Kernel Parity ────────────────────────────────────────────────
+
+class TestScoreAndToneParity:
+    """The (numba-compiled) kernel and the NumPy path must not drift apart."""
+
+    @staticmethod
+    def _paths():
+        from agents.emotional_intelligence import eia_agent
+        return (
+            eia_agent._score_and_tone,  # compiled when numba is installed
+            eia_agent._score_and_tone_kernel,
+            eia_agent._score_and_tone_numpy,
+        )
+
+    def test_random_probability_vectors(self):
+        import numpy as np
+        from agents.emotional_intelligence.eia_agent import _EMOTIONS
+
+        rng = np.random.default_rng(0)
+        for vec in rng.dirichlet(np.ones(len(_EMOTIONS)), size=500):
+            results = [fn(np.ascontiguousarray(vec)) for fn in self._paths()]
+            sentiments = [float(r[0]) for r in results]
+            assert sentiments == pytest.approx([sentiments[0]] * 3, abs=1e-12)
+            assert len({int(r[1]) for r in results}) == 1
+
+    @pytest.mark.parametrize("label,score", [
+        ("anger", 0.65), ("anger", 0.3), ("neutral", 1.0),
+        ("joy", 0.3), ("joy", 0.65), ("joy", 1.0), ("anger", 1.0),
+    ])
+    def test_tone_threshold_edges(self, label, score):
+        from agents.emotional_intelligence.eia_agent import _TONE_STRINGS, _emotion_vector
+
+        vec = _emotion_vector({label: score})
+        results = [fn(vec) for fn in self._paths()]
+        assert len({(float(s), int(i)) for s, i in results}) == 1
+        assert _TONE_STRINGS[int(results[0][1])] == _get_tone_recommendation(float(results[0][0]))
+
 
 # ── Escalation Policy ────────────────────────────────────────────────────────
 
@@ -99,6 +154,53 @@ class TestFallbackClassifier:
         result = _fallback_classify("The weather is mild today.")
         assert "neutral" in result
 
+    def test_polarity_matches_textblob(self):
+        from textblob import TextBlob
+        from agents.emotional_intelligence.emotion_classifier import _polarity
+
+        for text in ("I am very unhappy, this is terrible", "Great service!", "ok"):
+            assert _polarity(text) == TextBlob(text).sentiment.polarity
+
+    def test_batch_bins_keep_strict_thresholds(self):
+        polarities = {"a": 0.5, "b": 0.51, "c": -0.5, "d": 0.1, "e": 0.0}
+        with patch(
+            "agents.emotional_intelligence.emotion_classifier._polarity",
+            side_effect=polarities.__getitem__,
+        ):
+            results = _fallback_classify_batch(list(polarities))
+        assert results[0] == {"neutral": 0.5, "joy": 0.3, "surprise": 0.2}
+        assert results[1] == {"joy": 0.7, "neutral": 0.2, "surprise": 0.1}
+        assert results[2] == {"anger": 0.5, "disgust": 0.3, "sadness": 0.2}
+        assert results[3] == {"neutral": 0.8, "sadness": 0.1, "joy": 0.1}
+        assert results[4] == {"neutral": 0.8, "sadness": 0.1, "joy": 0.1}
+
+
+# ── Batched Classifier ───────────────────────────────────────────────────────
+
+class TestBatchedClassifier:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_forward_pass(self):
+        calls = []
+
+        def fake_classifier(texts, **kwargs):
+            calls.append(texts)
+            return [[{"label": "joy", "score": 0.9}, {"label": "anger", "score": 0.1}]
+                    for _ in texts]
+
+        with patch(
+            "agents.emotional_intelligence.emotion_classifier._get_classifier",
+            return_value=fake_classifier,
+        ):
+            results = await asyncio.gather(
+                classify_emotion("great"),
+                classify_emotion("awesome"),
+                classify_emotion("nice"),
+            )
+
+        assert len(calls) == 1
+        assert calls[0] == ["great", "awesome", "nice"]
+        assert all(r == {"joy": 0.9, "anger": 0.1} for r in results)
+
 
 # ── EIA Agent ─────────────────────────────────────────────────────────────────
 
@@ -127,3 +229,20 @@ class TestEIAAgent:
         )
         result = await agent.safe_process(input_data)
         assert result is not None
+
+    @pytest.mark.asyncio
+    async def test_preload_waits_for_background_warmup(self, monkeypatch):
+        import threading
+        import time
+        from agents.emotional_intelligence import emotion_classifier
+
+        monkeypatch.setattr(emotion_classifier, "_warmup_started", False)
+        monkeypatch.setattr(emotion_classifier, "_warmup_done", threading.Event())
+        loaded = []
+        monkeypatch.setattr(
+            emotion_classifier, "_warmup_sync", lambda: time.sleep(0.05) or loaded.append(1)
+        )
+
+        agent = EIAAgent()  # schedules the warmup in the background
+        await agent.preload()
+        assert loaded == [1]
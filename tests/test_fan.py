@@ -57,6 +57,14 @@ class TestTrendAnalyzer:
     def test_single_entry(self):
         assert analyze_sentiment_trend([{"csat_score": 4.0}]) is None
 
+    def test_skips_entries_without_score(self):
+        history = [
+            {"csat_score": 2.0},
+            {"comment": "no score"},
+            {"csat_score": 4.0},
+        ]
+        assert analyze_sentiment_trend(history) == "improving"
+
 
 class TestTopIssues:
     def test_extract_top_issues(self):
@@ -86,6 +94,22 @@ class TestKnowledgeGaps:
         assert len(gaps) > 0
         assert any("unresolved" in g.lower() for g in gaps)
 
+    def test_low_confidence_queries_deduplicated_in_order(self):
+        logs = [
+            {"intent": "unknown", "customer_message": "first"},
+            {"intent": "unclear", "customer_message": "second"},
+            {"intent": "unknown", "customer_message": "first"},
+            {"intent": "unresolved", "customer_message": "third"},
+            {"intent": "unknown", "customer_message": "fourth"},
+        ]
+        gaps = detect_knowledge_gaps(logs)
+        assert gaps == [
+            "5 interactions with unresolved intent",
+            "Low-confidence query: 'first'",
+            "Low-confidence query: 'second'",
+            "Low-confidence query: 'third'",
+        ]
+
     def test_no_gaps(self):
         logs = [
             {"intent": "billing_inquiry"},
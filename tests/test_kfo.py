@@ -4,7 +4,8 @@ Tests for the Knowledge Base & FAQ Optimizer Agent (KFO).
 
 import pytest
 
-from agents.knowledge_base.embedder import encode, _fallback_encode
+from agents.base_agent import get_agent
+from agents.knowledge_base.embedder import _fallback_encode
 from agents.knowledge_base.vector_store import VectorStore
 from agents.knowledge_base.kfo_agent import KFOAgent
 from api.schemas import KFOInput, KFOOutput
@@ -24,11 +25,40 @@ class TestEmbedder:
         norm = np.linalg.norm(result[0])
         assert abs(norm - 1.0) < 0.01
 
-    def test_encode_returns_array(self):
-        result = encode(["Hello world"])
+    def test_fallback_encode_deterministic(self):
+        import numpy as np
+        result = _fallback_encode(["same", "other", "same"])
+        assert result.dtype == np.float32
+        assert np.array_equal(result[0], result[2])
+        assert not np.array_equal(result[0], result[1])
+
+    def test_fallback_encode_shares_words(self):
+        result = _fallback_encode(["refund my order", ("Refund policy", "order refund"), "reset password"])
+        assert result[0] @ result[1] > result[0] @ result[2]
+
+    def test_encode_returns_array(self, embedder):
+        result = embedder.encode(["Hello world"])
         assert result is not None
         assert result.shape[0] == 1
 
+    def test_encode_only_runs_model_on_cache_misses(self, embedder, monkeypatch):
+        from collections import OrderedDict
+
+        batches = []
+
+        def fake_model_encode(texts):
+            batches.append(list(texts))
+            return _fallback_encode(texts)
+
+        monkeypatch.setattr(embedder, "_embedding_cache", OrderedDict())
+        monkeypatch.setattr(embedder, "_model_encode", fake_model_encode)
+        first = embedder.encode(["reset password", "billing"])
+        second = embedder.encode(["billing", "cancel order", "reset password"])
+        assert batches == [["reset password", "billing"], ["cancel order"]]
+        assert (second[0] == first[1]).all() and (second[2] == first[0]).all()
+        second[0] += 1.0  # returned arrays stay writable; the cache is unaffected
+        assert (embedder.encode(["billing"])[0] == first[1]).all()
+
 
 # ── Vector Store ──────────────────────────────────────────────────────────────
 
@@ -50,6 +80,51 @@ class TestVectorStore:
         assert len(results) <= 2
         assert results[0]["id"] == "a"
 
+    def test_brute_force_fallback_grows_buffer(self):
+        import numpy as np
+        from unittest.mock import patch
+        with patch("agents.knowledge_base.vector_store.FAISS_AVAILABLE", False):
+            store = VectorStore(dimension=4)
+            rng = np.random.default_rng(0)
+            first = rng.standard_normal((1000, 4)).astype(np.float32)
+            second = rng.standard_normal((500, 4)).astype(np.float32)
+            store.add(first, [{"id": i} for i in range(1000)])
+            store.add(second, [{"id": 1000 + i} for i in range(500)])
+            assert store.size == 1500
+
+            results = store.search(second[10], top_k=3)
+            assert results[0]["id"] == 1010
+            assert [r["score"] for r in results] == sorted(
+                (r["score"] for r in results), reverse=True
+            )
+
+    def test_brute_force_query_stays_float32(self):
+        import numpy as np
+        from unittest.mock import patch
+        with patch("agents.knowledge_base.vector_store.FAISS_AVAILABLE", False):
+            from agents.knowledge_base.vector_store import _normalized_copy
+            query = np.array([[3.0, 4.0, 0.0, 0.0]])  # float64 input
+            normalized = _normalized_copy(query)
+        assert normalized.dtype == np.float32
+        assert np.allclose(normalized, [[0.6, 0.8, 0.0, 0.0]])
+
+    def test_quantizer_trained_once_enough_vectors_buffered(self):
+        import numpy as np
+        from agents.knowledge_base import vector_store as vs
+        if not vs.FAISS_AVAILABLE:
+            pytest.skip("faiss not installed")
+        store = VectorStore(dimension=4)
+        rng = np.random.default_rng(1)
+        vectors = rng.standard_normal((4 * vs._SQ_TRAIN_FACTOR, 4)).astype(np.float32)
+        store.add(vectors[:3], [{"id": i} for i in range(3)])
+        assert not store.index.is_trained and store.size == 3
+        assert store.search(vectors[1], top_k=1)[0]["id"] == 1
+
+        store.add(vectors[3:], [{"id": i} for i in range(3, len(vectors))])
+        assert store.index.is_trained and store.index.ntotal == len(vectors)
+        assert store.size == len(vectors)
+        assert store.search(vectors[5], top_k=1)[0]["id"] == 5
+
     def test_empty_store_search(self):
         import numpy as np
         store = VectorStore(dimension=4)
@@ -58,12 +133,60 @@ class TestVectorStore:
         assert results == []
 
 
+# ── Micro-batcher ─────────────────────────────────────────────────────────────
+
+class TestMicroBatcher:
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_share_one_encode(self):
+        import asyncio
+        from agents.batcher import AsyncMicroBatcher
+
+        calls = []
+
+        def fake_encode(texts):
+            calls.append(list(texts))
+            return list(_fallback_encode(texts))
+
+        batcher = AsyncMicroBatcher(fake_encode, max_size=32, window_seconds=0.05)
+        texts = ["reset password", "billing issue", "cancel order"]
+        rows = await asyncio.gather(*(batcher.submit(t) for t in texts))
+        assert calls == [texts]
+        for text, row in zip(texts, rows):
+            assert (row == _fallback_encode([text])[0]).all()
+
+    @pytest.mark.asyncio
+    async def test_short_batch_result_fails_every_caller(self):
+        import asyncio
+        from agents.batcher import AsyncMicroBatcher
+
+        def short_encode(texts):
+            return list(_fallback_encode(texts))[:-1]
+
+        batcher = AsyncMicroBatcher(short_encode, max_size=32, window_seconds=0.05)
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(t) for t in ("a", "b", "c")),
+                           return_exceptions=True),
+            timeout=1,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert "short_encode returned 2 results for a batch of 3" in str(results[0])
+
+
 # ── KFO Agent ─────────────────────────────────────────────────────────────────
 
 class TestKFOAgent:
     @pytest.mark.asyncio
-    async def test_process_returns_articles(self):
+    async def test_preload_builds_faq_index(self):
         agent = KFOAgent()
+        await agent.preload()
+        assert agent._loaded and agent.vector_store.size > 0
+
+    def test_get_agent_returns_shared_instance(self):
+        assert get_agent(KFOAgent) is get_agent(KFOAgent)
+
+    @pytest.mark.asyncio
+    async def test_process_returns_articles(self):
+        agent = get_agent(KFOAgent)  # FAQ index is built once per process
         input_data = KFOInput(
             interaction_id="test-kfo-001",
             query_text="How do I reset my password?",
@@ -75,7 +198,7 @@ class TestKFOAgent:
 
     @pytest.mark.asyncio
     async def test_empty_query(self):
-        agent = KFOAgent()
+        agent = get_agent(KFOAgent)
         input_data = KFOInput(
             interaction_id="test-kfo-002",
             query_text="",
@@ -84,3 +207,27 @@ class TestKFOAgent:
         result = await agent.process(input_data)
         assert isinstance(result, KFOOutput)
         assert len(result.suggested_faq_articles) == 0
+
+    @pytest.mark.asyncio
+    async def test_repeat_turn_reuses_session_result(self):
+        from unittest.mock import patch
+
+        agent = KFOAgent()
+        input_data = KFOInput(
+            interaction_id="test-kfo-003",
+            query_text="How do I reset my password?",
+            top_k=3,
+            session_id="conv-1",
+        )
+        first = await agent.process(input_data)
+        with patch.object(agent._batcher, "submit") as submit, \
+                patch.object(agent.vector_store, "search") as search:
+            second = await agent.process(input_data.model_copy(update={"interaction_id": "t-4"}))
+        assert second is first
+        submit.assert_not_called()
+        search.assert_not_called()
+
+        # Another conversation is searched independently
+        with patch.object(agent.vector_store, "search", return_value=[]) as search:
+            await agent.process(input_data.model_copy(update={"session_id": "conv-2"}))
+        search.assert_called_once()
@@ -25,6 +25,13 @@ class TestLanguageDetector:
     def test_whitespace_only(self):
         assert detect_language("   ") == "en"
 
+    def test_mixed_text_majority_script(self):
+        assert detect_language("My account حسابي لا يعمل منذ أمس") == "ar"
+        assert detect_language("Please check order number 5521 شكرا") == "en"
+
+    def test_arabic_presentation_forms(self):
+        assert detect_language("ﻣﺮﺣﺒﺎ ﺑﻚ") == "ar"
+
 
 # ── Intent Classifier (Rule-Based) ───────────────────────────────────────────
 
@@ -50,6 +57,102 @@ class TestRuleBasedIntent:
         intent, score = _rule_based_intent("My app is not working properly")
         assert intent == "technical_support"
 
+    def test_rule_order_wins_over_position(self):
+        intent, _ = _rule_based_intent("HI, there is a wrong charge on my invoice")
+        assert intent == "billing_inquiry"
+
+    @pytest.mark.parametrize("message", [
+        "I think something is wrong with my phone",
+        "Which plan is cheapest?",
+        "Nothing works since yesterday",
+        "Can you explain this to me",
+        "the border wifi",
+    ])
+    def test_keywords_do_not_match_inside_words(self, message):
+        assert _rule_based_intent(message) == ("general_inquiry", 0.3)
+
+    def test_long_keywords_match_inflections(self):
+        assert _rule_based_intent("My orders are late")[0] == "order_status"
+        assert _rule_based_intent("I was charged twice")[0] == "billing_inquiry"
+
+    def test_every_higher_priority_rule_wins(self):
+        from agents.omni_channel_support.intent_classifier import _RULES
+
+        firsts = [(intent, keywords[0]) for intent, keywords in _RULES.items()]
+        for i, (high, high_kw) in enumerate(firsts):
+            for _, low_kw in firsts[i + 1:]:
+                message = f"{low_kw.upper()} and then {high_kw}"
+                assert _rule_based_intent(message) == (high, 0.6), message
+
+
+# ── Intent Classifier (Cache) ────────────────────────────────────────────────
+
+class TestIntentCache:
+    @pytest.mark.asyncio
+    async def test_repeat_message_skips_model(self):
+        from unittest.mock import patch
+        from agents.omni_channel_support import intent_classifier
+
+        intent_classifier._intent_cache.clear()
+        with patch.object(
+            intent_classifier, "_model_intent", return_value=("general_inquiry", 0.9)
+        ) as model:
+            first = await classify_intent("What are your opening hours")
+            second = await classify_intent("  what ARE your opening hours ")
+        intent_classifier._intent_cache.clear()
+
+        assert first == second == ("general_inquiry", 0.9)
+        assert model.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_keyword_hit_skips_model(self):
+        from unittest.mock import patch
+        from agents.omni_channel_support import intent_classifier
+
+        with patch.object(intent_classifier, "_model_intent") as model:
+            intent, confidence = await classify_intent("I want a refund")
+
+        assert (intent, confidence) == ("refund_request", 0.6)
+        model.assert_not_called()
+
+
+# ── Intent Classifier (ONNX) ─────────────────────────────────────────────────
+
+class TestOnnxIntent:
+    @staticmethod
+    def _fake_model(model_labels):
+        import numpy as np
+        from types import SimpleNamespace
+
+        session = SimpleNamespace(
+            get_inputs=lambda: [SimpleNamespace(name="input_ids")],
+            run=lambda _, feeds: [np.array([[2.0, 1.0, 0.5][:len(model_labels)]])],
+        )
+        tokenizer = lambda text, **kwargs: {"input_ids": np.array([[1, 2, 3]])}
+        return session, tokenizer, model_labels
+
+    def test_softmax_over_candidate_labels_only(self):
+        from agents.omni_channel_support.intent_classifier import _onnx_intent
+
+        model = self._fake_model(["billing_inquiry", "complaint", "greeting"])
+        label, score = _onnx_intent(model, "text", ["complaint", "greeting"])
+        assert label == "complaint"
+        assert score == pytest.approx(1 / (1 + 2.718281828 ** -0.5))
+
+    @pytest.mark.asyncio
+    async def test_no_label_overlap_uses_rule_fallback(self, monkeypatch):
+        from agents.omni_channel_support import intent_classifier
+
+        model = self._fake_model(["billing_inquiry", "complaint"])
+        monkeypatch.setattr(intent_classifier, "_get_onnx_classifier", lambda: model)
+        monkeypatch.setattr(intent_classifier, "_get_classifier", lambda: None)
+        intent_classifier._intent_cache.clear()
+
+        assert intent_classifier._onnx_intent(model, "text", ["product_information"]) is None
+        result = await classify_intent("tell me about plans", ["product_information"])
+        assert result == ("general_inquiry", 0.3)
+        assert not intent_classifier._intent_cache
+
 
 # ── OCS Agent ─────────────────────────────────────────────────────────────────
 
@@ -80,6 +183,23 @@ class TestOCSAgent:
         assert result.escalation_flag is True
         assert result.intent == "escalation_request"
 
+    @pytest.mark.asyncio
+    async def test_unlisted_intent_uses_unknown_template(self):
+        from unittest.mock import AsyncMock, patch
+        from agents.omni_channel_support import ocs_agent
+
+        agent = OCSAgent()
+        input_data = OCSInput(
+            interaction_id="test-004",
+            customer_message="مرحبا، لدي سؤال",
+            conversation_context={},
+        )
+        with patch.object(
+            ocs_agent, "classify_intent", AsyncMock(return_value=("warranty_claim", 0.8))
+        ):
+            result = await agent.process(input_data)
+        assert result.response_text == ocs_agent._RESPONSE_TEMPLATES["unknown"]["ar"]
+
     @pytest.mark.asyncio
     async def test_safe_process_returns_result(self):
         agent = OCSAgent()
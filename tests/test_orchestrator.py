@@ -76,6 +76,26 @@ class TestAggregator:
         assert response.response_text == ""
         assert response.intent == "unknown"
 
+    def test_agent_logs_keep_models_until_serialized(self):
+        ocs = OCSOutput(response_text="Hi", intent="greeting")
+        response = aggregate_outputs(
+            interaction_id="test-agg-003",
+            customer_id="CUST-003",
+            channel=ChannelType.CHAT,
+            language=SupportedLanguage.EN,
+            customer_message="Hi",
+            context={"emotion_trend": [], "unresolved_turns": 0},
+            ocs_output=ocs,
+            kfo_output=None,
+            eia_output=None,
+            pir_output=None,
+        )
+
+        assert response.agent_logs.ocs is ocs
+        dumped = response.model_dump()["agent_logs"]
+        assert dumped["ocs"] == ocs.model_dump()
+        assert dumped["eia"] == {"status": "skipped"}
+
 
 # ── Escalation Gate ───────────────────────────────────────────────────────────
 
@@ -139,3 +159,80 @@ class TestEscalationGate:
         )
         assert flag is True
         assert "resolution" in reason.lower() or "turns" in reason.lower()
+
+    def test_trigger_streak_counter_matches_trend_scan(self):
+        eia = EIAOutput(sentiment_score=-0.2, dominant_emotion="anger")
+        from_counter = _check_escalation(
+            None, eia, None, {"emotion_trend": [], "trigger_streak": 1, "unresolved_turns": 0}
+        )
+        from_trend = _check_escalation(
+            None, eia, None, {"emotion_trend": ["joy", "anger"], "unresolved_turns": 0}
+        )
+        assert from_counter == from_trend
+        assert "2 consecutive turns" in from_counter[1]
+
+
+# ── Agent Timeouts ────────────────────────────────────────────────────────────
+
+class TestAgentTimeout:
+    @pytest.mark.asyncio
+    async def test_slow_agent_degrades_to_none(self, monkeypatch):
+        import asyncio
+        from orchestrator import main
+
+        class _Slow:
+            agent_name = "SLOW"
+
+            async def safe_process(self, input_data):
+                await asyncio.sleep(1)
+
+        monkeypatch.setattr(
+            main, "settings", main.settings.model_copy(update={"agent_timeout_seconds": 0.01})
+        )
+        assert await main._run_agent(_Slow(), MagicMock(interaction_id="t-1")) is None
+
+
+# ── Interaction Writer ────────────────────────────────────────────────────────
+
+class TestInteractionWriter:
+    def test_rows_written_across_event_loops(self):
+        import asyncio
+        from orchestrator.interaction_writer import InteractionWriter
+
+        writer = InteractionWriter(flush_interval=0.01)
+        written = []
+
+        async def fake_write(rows):
+            written.extend(row["interaction_id"] for row in rows)
+
+        writer._write = fake_write
+
+        async def turn(interaction_id):
+            writer.enqueue({"interaction_id": interaction_id})
+            await asyncio.sleep(0.05)  # flushed; the writer now idles on the queue
+            await writer.close()
+
+        # e.g. two app lifespans (TestClient contexts, uvicorn reload)
+        asyncio.run(turn("first"))
+        asyncio.run(turn("second"))
+        assert written == ["first", "second"]
+
+
+# ── Timestamps ────────────────────────────────────────────────────────────────
+
+class TestIsoTimestamp:
+    def test_matches_strftime_format(self):
+        import time
+        from api.schemas import iso_utc_now
+
+        before = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        stamp = iso_utc_now()
+        after = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        assert stamp in (before, after)
+
+    def test_iso_utc_matches_strftime(self):
+        from datetime import datetime, timezone
+        from api.schemas import iso_utc
+
+        now = datetime(2024, 3, 5, 7, 8, 9, 123456, tzinfo=timezone.utc)
+        assert iso_utc(now) == now.strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -46,6 +46,120 @@ class TestAnomalyDetector:
         assert isinstance(anomalies, list)
 
 
+    def test_statistical_fallback_flags_multivariate_outlier(self):
+        import numpy as np
+        rng = np.random.default_rng(7)
+        logs = [
+            {"api_calls": float(a), "error_count": float(e)}
+            for a, e in zip(rng.normal(100, 5, 30), rng.normal(2, 0.5, 30))
+        ]
+        logs.append({"api_calls": 400.0, "error_count": 30.0})
+        keys = _extract_numeric_keys(logs)
+        matrix = _build_feature_matrix(logs, keys)
+
+        anomalies = _statistical_fallback(logs, keys, matrix)
+        assert [a["index"] for a in anomalies] == [30]
+        assert anomalies[0]["anomaly_score"] < -2.0
+
+    def test_wide_batch_falls_back_to_zscore(self):
+        # k >= n - 1: covariance is not estimable, per-feature z-scores still flag
+        logs = [
+            {f"m{j}": 10.0 + (i + j) % 2 for j in range(8)} for i in range(7)
+        ]
+        logs.append({**logs[0], "m3": 500.0})
+        keys = _extract_numeric_keys(logs)
+        matrix = _build_feature_matrix(logs, keys)
+        assert len(keys) >= matrix.shape[0] - 1
+
+        anomalies = _statistical_fallback(logs, keys, matrix)
+        assert [a["index"] for a in anomalies] == [7]
+        assert anomalies[0]["anomaly_score"] < -2.0
+
+    def test_isolation_forest_fitted_once_per_account_schema(self, monkeypatch):
+        from agents.proactive_issue import anomaly_detector
+
+        monkeypatch.setattr(anomaly_detector, "_ISOLATION_FOREST_MIN_SAMPLES", 10)
+        monkeypatch.setattr(anomaly_detector, "_MODEL_CACHE", anomaly_detector.OrderedDict())
+        fits = []
+        real_fit = anomaly_detector._fit_model
+        monkeypatch.setattr(
+            anomaly_detector, "_fit_model", lambda m: fits.append(m) or real_fit(m)
+        )
+        logs = [{"cache_hits": i % 7, "queue_depth": i % 3} for i in range(20)]
+
+        detect_anomalies(logs, account_id="ACC-1")
+        detect_anomalies(logs, account_id="ACC-1")
+        assert len(fits) == 1
+
+    def test_accounts_get_independent_models(self, monkeypatch):
+        from agents.proactive_issue import anomaly_detector
+
+        monkeypatch.setattr(anomaly_detector, "_ISOLATION_FOREST_MIN_SAMPLES", 10)
+        monkeypatch.setattr(anomaly_detector, "_MODEL_CACHE", anomaly_detector.OrderedDict())
+        fitted_on = {}
+        real_fit = anomaly_detector._fit_model
+
+        def fit(matrix):
+            model = real_fit(matrix)
+            fitted_on[id(model)] = matrix
+            return model
+
+        monkeypatch.setattr(anomaly_detector, "_fit_model", fit)
+        quiet = [{"api_calls": 10 + i % 3} for i in range(40)]
+        busy = [{"api_calls": 5000 + 10 * (i % 3)} for i in range(40)]
+
+        detect_anomalies(quiet, account_id="QUIET")
+        detect_anomalies(busy, account_id="BUSY")
+        detect_anomalies(quiet, account_id="QUIET")
+        cache = anomaly_detector._MODEL_CACHE
+        quiet_model = cache[("QUIET", ("api_calls",))][0]
+        busy_model = cache[("BUSY", ("api_calls",))][0]
+        assert len(fitted_on) == 2
+        # Each account's baseline comes from its own traffic only
+        assert fitted_on[id(quiet_model)].max() == 12
+        assert fitted_on[id(busy_model)].min() == 5000
+
+    def test_features_memoized_per_account_window(self, monkeypatch):
+        from agents.proactive_issue import anomaly_detector
+
+        monkeypatch.setattr(anomaly_detector, "_feature_cache", anomaly_detector.OrderedDict())
+        builds = []
+        real_build = anomaly_detector._build_feature_matrix
+        monkeypatch.setattr(
+            anomaly_detector,
+            "_build_feature_matrix",
+            lambda logs, keys: builds.append(1) or real_build(logs, keys),
+        )
+        logs = [{"timestamp": f"t{i}", "api_calls": 100 + i % 5} for i in range(10)]
+
+        first = detect_anomalies(logs, account_id="ACC-1")
+        second = detect_anomalies(logs, account_id="ACC-1")
+        detect_anomalies(logs, account_id="ACC-2")
+        assert first == second
+        assert len(builds) == 2
+
+    def test_fallback_scores_reused_for_cached_window(self, monkeypatch):
+        from agents.proactive_issue import anomaly_detector
+
+        monkeypatch.setattr(anomaly_detector, "_feature_cache", anomaly_detector.OrderedDict())
+        monkeypatch.setattr(anomaly_detector, "_score_cache", anomaly_detector.OrderedDict())
+        computed = []
+        real_compute = anomaly_detector._compute_fallback_scores
+        monkeypatch.setattr(
+            anomaly_detector,
+            "_compute_fallback_scores",
+            lambda m: computed.append(1) or real_compute(m),
+        )
+        logs = [{"timestamp": f"t{i}", "api_calls": 100 + i % 5} for i in range(10)]
+        logs.append({"timestamp": "t10", "api_calls": 900})
+
+        first = detect_anomalies(logs, account_id="ACC-1")
+        second = detect_anomalies(logs, account_id="ACC-1")
+        detect_anomalies(logs)  # uncached matrix: always recomputed
+        assert first == second and [a["index"] for a in first] == [10]
+        assert len(computed) == 2
+
+
 # ── Alert Builder ─────────────────────────────────────────────────────────────
 
 class TestAlertBuilder:
@@ -70,6 +184,11 @@ class TestAlertBuilder:
         assert alerts[0].severity == SeverityLevel.HIGH
         assert alerts[0].alert_type == "high_error_rate"
 
+    def test_batch_severities_match_scalar_mapping(self):
+        scores = [-3.0, -2.0, -1.0, -0.5, 0.2]
+        alerts = build_alerts([{"anomaly_score": s, "data": {}} for s in scores], "ACC-001")
+        assert [a.severity for a in alerts] == [_determine_severity(s) for s in scores]
+
     def test_empty_anomalies(self):
         alerts = build_alerts([], "ACC-001")
         assert alerts == []